@@ -0,0 +1,127 @@
+"""Per-line cost of ``extract_table_data`` against the original multi-scan parser.
+
+    python -m benchmarks.extract_table_data
+
+Lines are synthetic statement rows (card payments, transfers, direct debits,
+fees) mixed with the header and footer lines a real page also carries. Both
+implementations must produce the same rows.
+"""
+
+from __future__ import annotations
+
+import random
+import timeit
+
+from converter.extraction import extract_table_data
+from converter.profiles import AMOUNT_RE, TIDE
+
+DATE_RE = TIDE.date_re
+TRANSACTION_TYPES = TIDE.transaction_types
+INCOME_KEYWORDS = TIDE.income_keywords['Domestic Transfer']
+
+MONTHS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+NOISE = [
+    ['Date', 'Transaction type', 'Details', 'Paid in (£)', 'Paid out (£)', 'Balance (£)'],
+    ['Statement period', '1 Jan 2024 - 31 Jan 2024'],
+    ['Page 1 of 12'],
+    ['Tide is a trading name of Tide Platform Ltd', 'Registered in England'],
+]
+DETAILS = {
+    'Card Transaction': [['Tide Card', '****', 'Uber trip'], ['Tide Card', '****', 'Amazon Marketplace']],
+    'Card Transaction Refund': [['Tide Card', '****', 'Refund Amazon']],
+    'Domestic Transfer': [['SUMUP PAYMENTS', 'Payout'], ['J Smith', 'Invoice 1042']],
+    'Direct Debit': [['BT Group', 'Broadband']],
+    'Fee': [['Monthly account fee']],
+}
+
+
+def multi_scan(lines: list[list[dict]]) -> list[dict]:
+    """The original implementation: several joins and scans per line."""
+    rows = []
+    for line in lines:
+        all_text = [item['text'] for item in line]
+        date_match = DATE_RE.match(' '.join(all_text))
+        if not date_match:
+            continue
+
+        trans_type = ''
+        trans_type_index = -1
+        for candidate in TRANSACTION_TYPES:
+            words = candidate.split(' ')
+            idx = next((i for i, t in enumerate(all_text) if words[0] in t), -1)
+            if idx != -1 and candidate in ' '.join(all_text[idx:idx + len(words)]):
+                trans_type = candidate
+                trans_type_index = idx
+                break
+
+        if not trans_type:
+            continue
+
+        numbers = []
+        for i, text in enumerate(all_text):
+            text = text.replace(',', '')
+            if AMOUNT_RE.match(text):
+                numbers.append((text, i))
+
+        if len(numbers) < 2:
+            continue
+
+        balance = numbers[-1][0]
+        paid_in = ''
+        paid_out = ''
+
+        if len(numbers) == 3:
+            paid_in = numbers[0][0]
+            paid_out = numbers[1][0]
+        elif len(numbers) == 2:
+            amount = numbers[0][0]
+            details_text = ' '.join(all_text).lower()
+            is_income = trans_type == 'Card Transaction Refund' or (
+                trans_type == 'Domestic Transfer' and any(k in details_text for k in INCOME_KEYWORDS)
+            )
+            if is_income:
+                paid_in = amount
+            else:
+                paid_out = amount
+
+        details = [
+            text for text in all_text[trans_type_index + 1:numbers[0][1]]
+            if text and 'Tide Card' not in text and text != '****'
+        ]
+
+        rows.append({
+            'Date': date_match.group(1),
+            'Transaction type': trans_type,
+            'Details': ' '.join(' '.join(details).split()),
+            'Paid in (£)': paid_in,
+            'Paid out (£)': paid_out,
+            'Balance (£)': balance,
+        })
+    return rows
+
+
+def synthetic_lines(count: int, seed: int = 0) -> list[list[dict]]:
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(count):
+        if rng.random() < 0.25:
+            tokens = list(rng.choice(NOISE))
+        else:
+            trans_type = rng.choice(TRANSACTION_TYPES)
+            amounts = [f'{rng.uniform(1, 5000):,.2f}' for _ in range(rng.choice((2, 2, 3)))]
+            date = f'{rng.randint(1, 28)} {rng.choice(MONTHS)} 2024'
+            tokens = [date, trans_type, *rng.choice(DETAILS[trans_type]), *amounts]
+        lines.append([{'text': text, 'x': x * 60, 'y': 0, 'height': 10} for x, text in enumerate(tokens)])
+    return lines
+
+
+def main() -> None:
+    lines = synthetic_lines(10_000)
+    assert extract_table_data(lines) == multi_scan(lines)
+    for name, fn in (('multi-scan', multi_scan), ('single-pass', extract_table_data)):
+        seconds = min(timeit.repeat(lambda: fn(lines), number=5, repeat=5)) / 5
+        print(f'{name:<12} {seconds / len(lines) * 1e6:6.2f} us/line')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""Compare bucketed ``group_into_lines`` with the original sort-and-scan.
+
+    python -m benchmarks.group_into_lines
+
+Pages are synthetic: rows of items on jittered baselines, shuffled as pdf.js
+and pdfplumber may return them. Both implementations must produce the same
+lines.
+"""
+
+from __future__ import annotations
+
+import random
+import timeit
+
+from converter.extraction import Y_THRESHOLD, group_into_lines
+
+
+def sort_and_scan(items: list[dict]) -> list[list[dict]]:
+    """The original implementation: sort every item by y, then split on gaps."""
+    items = sorted(items, key=lambda item: -item['y'])
+
+    lines = []
+    current_line = []
+    current_y = None
+
+    for item in items:
+        if item['text'] == '':
+            continue
+
+        if current_y is None or abs(item['y'] - current_y) <= Y_THRESHOLD:
+            current_line.append(item)
+            current_y = item['y']
+        else:
+            if current_line:
+                current_line.sort(key=lambda i: i['x'])
+                lines.append(current_line)
+            current_line = [item]
+            current_y = item['y']
+
+    if current_line:
+        current_line.sort(key=lambda i: i['x'])
+        lines.append(current_line)
+
+    return lines
+
+
+def synthetic_page(item_count: int, items_per_row: int = 8, seed: int = 0) -> list[dict]:
+    rng = random.Random(seed)
+    rows = -(-item_count // items_per_row)
+    # Tall enough that rows sit 12pt apart, like statement table rows.
+    height = rows * 12 + 100
+    items = []
+    for i in range(item_count):
+        row, col = divmod(i, items_per_row)
+        items.append({
+            'text': f'item{i}',
+            'x': col * 70 + rng.randint(0, 3),
+            'y': height - 50 - row * 12 + rng.randint(-1, 1),
+            'height': 10,
+        })
+    rng.shuffle(items)
+    return items
+
+
+def main() -> None:
+    for item_count in (1_000, 10_000):
+        items = synthetic_page(item_count)
+        assert group_into_lines(items) == sort_and_scan(items)
+        number = max(1, 200_000 // item_count)
+        for name, fn in (('sort-and-scan', sort_and_scan), ('bucketed', group_into_lines)):
+            seconds = min(timeit.repeat(lambda: fn(items), number=number, repeat=5)) / number
+            print(f'{item_count:>6} items  {name:<14} {seconds * 1e3:8.3f} ms/page')
+
+
+if __name__ == '__main__':
+    main()
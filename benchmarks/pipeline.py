@@ -0,0 +1,169 @@
+"""Stage-by-stage timing of the converter on synthetic statements.
+
+    python -m benchmarks.pipeline --pages 1 10 100 -o benchmark-results.json
+
+Each statement from ``statement_pdf.make_statement`` is run through the
+pipeline one stage at a time: text extraction, ``group_into_lines``, row
+parsing, DataFrame construction, ``categorize_frame``, the category summary
+and CSV export. Stage times are the best of ``--repeat`` runs. Peak memory,
+overall and per stage above what earlier stages still hold, comes from a
+separate run under ``tracemalloc`` (Python allocations only), so tracing
+does not distort the times. Results are written as JSON to compare between
+releases.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import subprocess
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from converter.export import convert_to_csv
+from converter.extraction import CSV_COLUMNS, _open, extract_table_data, group_into_lines, page_items
+from converter.profiles import detect_profile
+from converter.summary import summarize
+from converter.vectorized import categorize_frame
+
+from .statement_pdf import make_statement
+
+STAGES = ('text_extraction', 'group_into_lines', 'parse_rows', 'build_frame', 'categorize', 'aggregate', 'csv_export')
+
+
+def run_stages(pdf_bytes: bytes, stage) -> dict:
+    """Run the pipeline once, wrapping each stage in the ``stage(name)`` context manager."""
+    with stage('text_extraction'), _open(pdf_bytes) as pdf:
+        pages = [page_items(page) for page in pdf.pages]
+
+    with stage('group_into_lines'):
+        page_lines = [group_into_lines(items) for items in pages]
+
+    with stage('parse_rows'):
+        profile = detect_profile(' '.join(item['text'] for item in pages[0])).with_header_columns(page_lines[0])
+        rows = [row for lines in page_lines for row in extract_table_data(lines, profile)]
+
+    with stage('build_frame'):
+        df = pd.DataFrame(rows, columns=CSV_COLUMNS)
+
+    with stage('categorize'):
+        df['Category'] = categorize_frame(df)
+
+    with stage('aggregate'):
+        summarize(df)
+
+    with stage('csv_export'):
+        convert_to_csv(df, CSV_COLUMNS)
+
+    return {
+        'items': sum(len(items) for items in pages),
+        'lines': sum(len(lines) for lines in page_lines),
+        'rows': len(rows),
+    }
+
+
+def time_stages(pdf_bytes: bytes, repeat: int) -> tuple[dict, dict[str, float]]:
+    best: dict[str, float] = {}
+
+    @contextmanager
+    def stage(name):
+        start = time.perf_counter()
+        yield
+        elapsed = time.perf_counter() - start
+        best[name] = min(best.get(name, elapsed), elapsed)
+
+    for _ in range(repeat):
+        counts = run_stages(pdf_bytes, stage)
+    return counts, best
+
+
+def trace_memory(pdf_bytes: bytes) -> dict[str, tuple[int, int]]:
+    """Peak traced memory during each stage, and how far it rose above the stage's start."""
+    peaks: dict[str, tuple[int, int]] = {}
+
+    @contextmanager
+    def stage(name):
+        tracemalloc.reset_peak()
+        start = tracemalloc.get_traced_memory()[0]
+        yield
+        peak = tracemalloc.get_traced_memory()[1]
+        peaks[name] = (peak, peak - start)
+
+    tracemalloc.start()
+    try:
+        run_stages(pdf_bytes, stage)
+    finally:
+        tracemalloc.stop()
+    return peaks
+
+
+def benchmark(pages: int, rows_per_page: int, repeat: int, seed: int = 0) -> dict:
+    pdf_bytes = make_statement(pages, rows_per_page, seed)
+    counts, seconds = time_stages(pdf_bytes, repeat)
+    peaks = trace_memory(pdf_bytes)
+    return {
+        'pages': pages,
+        'rows_per_page': rows_per_page,
+        'pdf_bytes': len(pdf_bytes),
+        **counts,
+        'total_seconds': sum(seconds.values()),
+        'peak_bytes': max(peak for peak, _ in peaks.values()),
+        'stages': {
+            name: {
+                'seconds': seconds[name],
+                'pages_per_second': pages / seconds[name] if seconds[name] else None,
+                'rows_per_second': counts['rows'] / seconds[name] if seconds[name] else None,
+                'peak_bytes': peaks[name][0],
+                'stage_peak_bytes': peaks[name][1],
+            }
+            for name in STAGES
+        },
+    }
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Time each converter stage on synthetic statements.')
+    parser.add_argument('--pages', type=int, nargs='+', default=[1, 10, 50])
+    parser.add_argument('--rows-per-page', type=int, default=40)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-o', '--output', default='benchmark-results.json')
+    args = parser.parse_args()
+
+    results = []
+    for pages in args.pages:
+        result = benchmark(pages, args.rows_per_page, args.repeat, args.seed)
+        results.append(result)
+        print(f"{pages} pages, {result['rows']} rows: {result['total_seconds'] * 1e3:.1f} ms, "
+              f"peak {result['peak_bytes'] / 2**20:.1f} MiB")
+        for name, stage in result['stages'].items():
+            print(f"  {name:<17} {stage['seconds'] * 1e3:9.2f} ms  +{stage['stage_peak_bytes'] / 2**20:7.2f} MiB")
+
+    with open(args.output, 'w', encoding='utf-8') as fh:
+        json.dump({
+            'created': datetime.now(timezone.utc).isoformat(),
+            'revision': _git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'repeat': args.repeat,
+            'seed': args.seed,
+            'results': results,
+        }, fh, indent=2)
+
+
+if __name__ == '__main__':
+    main()
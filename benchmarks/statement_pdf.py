@@ -0,0 +1,144 @@
+"""Synthetic Tide-format statement PDFs for benchmarking.
+
+    python -m benchmarks.statement_pdf --pages 20 --rows-per-page 40 -o statement.pdf
+
+Pages carry the bank name, a column header row and transaction rows laid out
+in the same columns as a Tide statement, with a running balance. The PDF is
+written directly (Helvetica text objects, no images or compression) so no
+PDF library is needed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+
+from converter.profiles import TIDE
+
+PAGE_WIDTH = 595
+PAGE_HEIGHT = 842
+FONT_SIZE = 8
+ROW_HEIGHT = 16
+TOP = 760
+
+# Left edge of each column, in points
+COLUMN_X = {
+    'Date': 40,
+    'Transaction type': 100,
+    'Details': 200,
+    'Paid in': 380,
+    'Paid out': 440,
+    'Balance': 510,
+}
+
+MONTHS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+# Detail text per transaction type; the first Domestic Transfer is income
+DETAILS = {
+    'Card Transaction': ['Uber trip', 'Amazon Marketplace', 'Starbucks London', 'Adobe Creative Cloud', 'Shell Fuel'],
+    'Card Transaction Refund': ['Refund Amazon'],
+    'Domestic Transfer': ['SUMUP PAYMENTS Payout', 'J Smith Invoice 1042', 'Landlord rent'],
+    'Direct Debit': ['BT Group Broadband', 'Aviva Insurance premium', 'HMRC VAT'],
+    'Fee': ['Monthly account fee'],
+}
+
+
+def _escape(text: str) -> str:
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def _text(x: float, y: float, text: str) -> str:
+    return f'BT /F1 {FONT_SIZE} Tf {x} {y} Td ({_escape(text)}) Tj ET'
+
+
+def _transaction(rng: random.Random, balance: float) -> tuple[list[tuple[str, str]], float]:
+    trans_type = rng.choice(TIDE.transaction_types)
+    details = rng.choice(DETAILS[trans_type])
+    amount = round(rng.uniform(1, 2000), 2)
+    income = trans_type == 'Card Transaction Refund' or details.startswith('SUMUP')
+    if not income and amount > balance:
+        # Statements here never go overdrawn, so take a card payout instead
+        trans_type, details, income = 'Domestic Transfer', DETAILS['Domestic Transfer'][0], True
+    balance = round(balance + amount if income else balance - amount, 2)
+    date = f'{rng.randint(1, 28)} {rng.choice(MONTHS)} 2024'
+
+    cells = [('Date', date), ('Transaction type', trans_type)]
+    if trans_type.startswith('Card'):
+        cells += [('Details', 'Tide Card'), ('Details+', '****'), ('Details++', details)]
+    else:
+        cells.append(('Details', details))
+    cells.append(('Paid in' if income else 'Paid out', f'{amount:,.2f}'))
+    cells.append(('Balance', f'{balance:,.2f}'))
+    return cells, balance
+
+
+def _cell_x(column: str) -> float:
+    # Card rows split their details over three items, spaced so they stay separate words
+    offset = column.count('+') * 45
+    return COLUMN_X[column.rstrip('+')] + offset
+
+
+def page_content(rng: random.Random, page_num: int, page_count: int, rows: int, balance: float) -> tuple[str, float]:
+    ops = [
+        _text(40, 800, 'Tide - Business Account Statement'),
+        _text(40, 785, f'Page {page_num} of {page_count}'),
+    ]
+    for label, x in COLUMN_X.items():
+        ops.append(_text(x, TOP, label))
+    for i in range(rows):
+        cells, balance = _transaction(rng, balance)
+        y = TOP - (i + 1) * ROW_HEIGHT
+        ops.extend(_text(_cell_x(column), y, text) for column, text in cells)
+    ops.append(_text(40, 30, 'Tide is a trading name of Tide Platform Ltd'))
+    return '\n'.join(ops), balance
+
+
+def make_statement(pages: int, rows_per_page: int = 40, seed: int = 0) -> bytes:
+    """Return a ``pages``-page statement with ``rows_per_page`` transactions per page."""
+    rows_per_page = min(rows_per_page, (TOP - 60) // ROW_HEIGHT)
+    rng = random.Random(seed)
+
+    # Objects 1-3 are the catalog, page tree and font; each page adds a page
+    # object and its content stream
+    objects = [None, None, b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>']
+    page_ids = []
+    balance = 10_000.0
+    for page_num in range(1, pages + 1):
+        content, balance = page_content(rng, page_num, pages, rows_per_page, balance)
+        stream = content.encode('latin-1')
+        objects.append(b'<< /Length %d >>\nstream\n%s\nendstream' % (len(stream), stream))
+        content_id = len(objects)
+        objects.append((
+            f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] '
+            f'/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>'
+        ).encode())
+        page_ids.append(len(objects))
+    objects[0] = b'<< /Type /Catalog /Pages 2 0 R >>'
+    kids = ' '.join(f'{i} 0 R' for i in page_ids)
+    objects[1] = f'<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>'.encode()
+
+    out = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b'%d 0 obj\n%s\nendobj\n' % (number, body)
+    xref = len(out)
+    out += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    out += b''.join(b'%010d 00000 n \n' % offset for offset in offsets)
+    out += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Write a synthetic Tide statement PDF.')
+    parser.add_argument('--pages', type=int, default=10)
+    parser.add_argument('--rows-per-page', type=int, default=40)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-o', '--output', default='statement.pdf')
+    args = parser.parse_args()
+    with open(args.output, 'wb') as fh:
+        fh.write(make_statement(args.pages, args.rows_per_page, args.seed))
+
+
+if __name__ == '__main__':
+    main()
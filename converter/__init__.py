@@ -0,0 +1,17 @@
+"""Python conversion engine for bank statement PDFs."""
+
+from .categories import CATEGORIES, categorize_transaction
+from .extraction import CSV_COLUMNS, extract_rows, extract_transactions
+from .profiles import PROFILES, BankProfile, detect_profile, register_profile
+
+__all__ = [
+    'CATEGORIES',
+    'CSV_COLUMNS',
+    'PROFILES',
+    'BankProfile',
+    'categorize_transaction',
+    'detect_profile',
+    'extract_rows',
+    'extract_transactions',
+    'register_profile',
+]
@@ -0,0 +1,79 @@
+"""On-disk LRU cache of converted statements.
+
+Entries are keyed by the SHA-256 of the PDF bytes plus ``rules_version()``,
+so editing the categorisation rules invalidates every cached result. Each
+entry is a JSON file of the categorised rows; reads refresh the file's
+mtime and writes evict the least recently used files once the directory
+exceeds ``max_bytes``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from .categories import rules_version
+
+# Bump when the extraction output changes, in shape or in the rows a PDF
+# gives, so stale entries are ignored. 2: amounts assigned by column.
+CACHE_FORMAT = 2
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+class ResultCache:
+    def __init__(self, directory, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def key(pdf_bytes: bytes, profile: str | None = None) -> str:
+        """Key for ``pdf_bytes`` parsed with ``profile``, or the detected layout if ``None``."""
+        digest = hashlib.sha256(pdf_bytes).hexdigest()
+        layout = f'-{profile}' if profile else ''
+        return f'{digest}{layout}-{rules_version()}-v{CACHE_FORMAT}'
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f'{key}.json'
+
+    def get(self, key: str) -> list[dict] | None:
+        path = self._path(key)
+        try:
+            with open(path, encoding='utf-8') as fh:
+                rows = json.load(fh)
+        except (OSError, ValueError):
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            # Another process may evict the file between the read and this;
+            # the rows already read are still good
+            pass
+        return rows
+
+    def put(self, key: str, rows: list[dict]) -> None:
+        path = self._path(key)
+        tmp = path.with_suffix(f'.{os.getpid()}.tmp')
+        with open(tmp, 'w', encoding='utf-8') as fh:
+            json.dump(rows, fh, ensure_ascii=False)
+        os.replace(tmp, path)
+        self._evict()
+
+    def _evict(self) -> None:
+        entries = []
+        for path in self.directory.glob('*.json'):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
@@ -0,0 +1,119 @@
+"""Categorisation rules shared with the browser converter.
+
+``CATEGORIES`` and ``categorize_transaction`` mirror the ``categories`` table
+and ``categorizeTransaction`` in ``streamlit_app.py``; keep the two in step.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from functools import lru_cache
+
+from .matcher import KeywordMatcher
+
+CATEGORIES = {
+    'income': {
+        'Card Payments': ['sumup', 'paymentsense', 'evo payments', 'dojo', 'american express', 'worldpay', 'stripe', 'square', 'paypal'],
+        'Bank Transfers': ['transfer', 'payment received', 'bacs'],
+        'Refunds': ['refund', 'reimbursement'],
+        'Other Income': [],
+    },
+    'expenses': {
+        'Advertising & Marketing': ['google ads', 'facebook ads', 'meta', 'instagram', 'linkedin', 'twitter', 'tiktok', 'advertising', 'marketing', 'mailchimp', 'hubspot'],
+        'Bank Fees & Charges': ['bank charge', 'bank fee', 'overdraft', 'interest charge', 'account fee', 'transaction fee'],
+        'Office Supplies': ['amazon', 'staples', 'office depot', 'ryman', 'viking', 'supplies'],
+        'Professional Services': ['accountant', 'solicitor', 'lawyer', 'consultant', 'hmrc', 'companies house'],
+        'Software & Subscriptions': ['microsoft', 'adobe', 'dropbox', 'zoom', 'slack', 'canva', 'notion', 'asana', 'trello', 'xero', 'quickbooks', 'sage', 'shopify', 'wix', 'squarespace'],
+        'Utilities & Communications': ['bt', 'vodafone', 'o2', 'ee', 'three', 'virgin', 'sky', 'talk talk', 'plusnet', 'telephone', 'internet', 'broadband', 'mobile'],
+        'Travel & Transport': ['uber', 'trainline', 'national rail', 'tfl', 'transport for london', 'parking', 'petrol', 'fuel', 'shell', 'bp', 'esso', 'tesco fuel'],
+        'Meals & Entertainment': ['restaurant', 'cafe', 'coffee', 'starbucks', 'costa', 'pret', 'food', 'lunch', 'dinner', 'deliveroo', 'uber eats', 'just eat'],
+        'Rent & Property': ['rent', 'lease', 'property', 'landlord', 'commercial rent'],
+        'Equipment & Technology': ['currys', 'pc world', 'apple', 'dell', 'hp', 'lenovo', 'equipment'],
+        'Insurance': ['insurance', 'policy', 'premium'],
+        'Payment Processing Fees': ['sumup fee', 'stripe fee', 'paypal fee', 'merchant fee', 'card fee'],
+        'Cost of Goods Sold': ['supplier', 'wholesale', 'inventory', 'stock', 'manufacturer'],
+        'Payroll & Staff': ['salary', 'wage', 'payroll', 'hmrc paye', 'pension'],
+        'Taxes': ['vat', 'tax', 'hmrc', 'corporation tax', 'self assessment'],
+        'General Business Expenses': [],
+    },
+}
+
+# Categories for rows no keyword matched, by transaction type; hashed into
+# ``rules_version()`` with ``CATEGORIES``
+INCOME_TYPE_DEFAULTS = {'Card Transaction Refund': 'Refunds', 'Domestic Transfer': 'Bank Transfers'}
+EXPENSE_TYPE_DEFAULTS = {'Direct Debit': 'Utilities & Communications', 'Fee': 'Bank Fees & Charges'}
+DEFAULT_INCOME = 'Other Income'
+DEFAULT_EXPENSE = 'General Business Expenses'
+
+# Compiled once; rebuild with ``compile_rules()`` after editing ``CATEGORIES``.
+_MATCHERS: dict[str, KeywordMatcher] = {}
+
+# Space-separated tokens of digits, '*', 'x' and separators with at least one
+# digit or '*': references, card masks and dates. ``compile_rules`` rejects
+# keywords containing '#' or a word made only of these characters, so the
+# merchant key matches exactly the keywords the full description does. Mirrors
+# ``MERCHANT_NOISE_RE`` in the browser.
+MERCHANT_NOISE_RE = re.compile(r'(?:^|(?<= ))[\d*x#/.:-]*[\d*][\d*x#/.:-]*(?= |$)')
+
+# A keyword word the noise pattern could swallow; ``compile_rules`` rejects these
+_NOISE_WORD_RE = re.compile(r'[\d*x#/.:-]+')
+
+MERCHANT_MEMO_SIZE = 5000
+
+
+def merchant_key(details: str) -> str:
+    """Lowercase ``details`` with references, card masks and dates replaced by ``#``."""
+    return MERCHANT_NOISE_RE.sub('#', details.lower()).strip()
+
+
+@lru_cache(maxsize=MERCHANT_MEMO_SIZE)
+def _keyword_category(group: str, key: str) -> str | None:
+    return _MATCHERS[group].first_category(key)
+
+
+def compile_rules() -> None:
+    """Build the keyword matchers from ``CATEGORIES``.
+
+    Raises ``ValueError`` for a keyword that contains ``#`` or a word made only
+    of digits, ``*``, ``x`` and separators: merchant keys replace such words,
+    so the keyword would never match.
+    """
+    for group, rules in CATEGORIES.items():
+        for category, keywords in rules.items():
+            for keyword in keywords:
+                if '#' in keyword or any(_NOISE_WORD_RE.fullmatch(word) for word in keyword.split(' ')):
+                    raise ValueError(f'{group} keyword {keyword!r} for {category!r} can never match a merchant key')
+    _MATCHERS.clear()
+    _MATCHERS.update({group: KeywordMatcher(rules) for group, rules in CATEGORIES.items()})
+    _keyword_category.cache_clear()
+
+
+compile_rules()
+
+
+def categorize_transaction(details: str, trans_type: str, paid_in: str, paid_out: str) -> str:
+    # Determine if it's income or expense
+    is_income = paid_in != ''
+
+    # First category, in table order, with a keyword in the details; the scan
+    # runs once per merchant
+    category_name = _keyword_category('income' if is_income else 'expenses', merchant_key(details))
+    if category_name is not None:
+        return category_name
+
+    # Default categories based on transaction type
+    if is_income:
+        return INCOME_TYPE_DEFAULTS.get(trans_type, DEFAULT_INCOME)
+    return EXPENSE_TYPE_DEFAULTS.get(trans_type, DEFAULT_EXPENSE)
+
+
+def rules_version() -> str:
+    """Short fingerprint of ``CATEGORIES`` and the type defaults; changes
+    whenever a rule is edited."""
+    rules = json.dumps(
+        [CATEGORIES, INCOME_TYPE_DEFAULTS, EXPENSE_TYPE_DEFAULTS, DEFAULT_INCOME, DEFAULT_EXPENSE],
+        ensure_ascii=False, separators=(',', ':'),
+    )
+    return hashlib.sha256(rules.encode('utf-8')).hexdigest()[:16]
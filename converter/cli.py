@@ -0,0 +1,206 @@
+"""Headless batch converter: ``python -m converter statements/ -o out/``.
+
+Each PDF is converted in its own worker process and written to
+``<out>/<name>.csv``, where ``<name>`` is the PDF's path below the inputs'
+common folder. Directories are searched recursively. With more than one PDF,
+all rows are also written to ``<out>/combined.csv`` with that path in a
+leading ``Source file`` column. ``--format`` adds or replaces CSV with
+typed Parquet, Arrow IPC or Excel files of the same rows.
+"""
+
+from __future__ import annotations
+
+import argparse
+import glob
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Sequence
+
+import pandas as pd
+
+from .cache import ResultCache
+from .columnar import write_arrow, write_parquet
+from .export import write_csv
+from .extraction import CSV_COLUMNS, extract_transactions
+from .page_store import PageStore
+from .profiles import PROFILES
+from .xlsx import write_xlsx
+
+SOURCE_COLUMN = 'Source file'
+
+# Output format -> (file suffix, writer taking df, path, columns)
+WRITERS = {
+    'csv': ('.csv', write_csv),
+    'parquet': ('.parquet', write_parquet),
+    'arrow': ('.arrow', write_arrow),
+    'xlsx': ('.xlsx', write_xlsx),
+}
+
+
+def write_outputs(df: pd.DataFrame, path: Path, columns: list[str], formats: Sequence[str]) -> None:
+    """Write ``df`` once per format, swapping ``path``'s suffix for that format's."""
+    for fmt in formats:
+        suffix, writer = WRITERS[fmt]
+        writer(df, path.with_suffix(suffix), columns)
+
+
+def find_pdfs(inputs: list[str]) -> list[Path]:
+    """Expand directories, searched recursively, and glob patterns into a sorted,
+    de-duplicated list of PDFs."""
+    found = {}
+    for pattern in inputs:
+        path = Path(pattern)
+        if path.is_dir():
+            matches = [p for p in path.rglob('*') if p.suffix.lower() == '.pdf']
+        else:
+            matches = [Path(p) for p in glob.glob(pattern, recursive=True)]
+        for match in matches:
+            if match.is_file():
+                found.setdefault(match.resolve(), match)
+    return sorted(found.values())
+
+
+def source_names(paths: list[Path]) -> dict[Path, str]:
+    """Name each PDF by its path below the common folder of all of them, so
+    statements with the same file name in different folders stay apart."""
+    resolved = {path: path.resolve() for path in paths}
+    root = os.path.commonpath([p.parent for p in resolved.values()])
+    return {path: p.relative_to(root).as_posix() for path, p in resolved.items()}
+
+
+def output_names(names: dict[Path, str], reserved: tuple[str, ...] = ()) -> dict[Path, str]:
+    """Output file name, without suffix, for each source name.
+
+    Names that would collide with an earlier one, ignoring case and the PDF
+    suffix, or with a ``reserved`` output such as the combined file, get a
+    ``-2``, ``-3``... suffix.
+    """
+    taken = {name.lower() for name in reserved}
+    outputs = {}
+    for path, name in names.items():
+        stem = output = str(Path(name).with_suffix(''))
+        n = 1
+        while output.lower() in taken:
+            n += 1
+            output = f'{stem}-{n}'
+        taken.add(output.lower())
+        outputs[path] = output
+    return outputs
+
+
+def convert_file(
+    path: Path,
+    out_dir: Path,
+    page_workers: int = 1,
+    cache_dir: str | None = None,
+    profile: str | None = None,
+    formats: Sequence[str] = ('csv',),
+    page_store: str | None = None,
+    name: str | None = None,
+) -> pd.DataFrame:
+    """Convert one PDF and write it as ``<out_dir>/<name>`` in each format (default: the PDF's stem)."""
+    bank_profile = PROFILES[profile] if profile else None
+    store = PageStore(page_store) if page_store else None
+    try:
+        if cache_dir:
+            pdf_bytes = path.read_bytes()
+            cache = ResultCache(cache_dir)
+            key = cache.key(pdf_bytes, profile)
+            rows = cache.get(key)
+            if rows is None:
+                df = extract_transactions(pdf_bytes, page_workers, bank_profile, store)
+                cache.put(key, df.to_dict('records'))
+            else:
+                df = pd.DataFrame(rows, columns=CSV_COLUMNS)
+        else:
+            df = extract_transactions(path, page_workers, bank_profile, store)
+    finally:
+        if store is not None:
+            store.close()
+    output = out_dir / f'{name or path.stem}.csv'
+    output.parent.mkdir(parents=True, exist_ok=True)
+    write_outputs(df, output, CSV_COLUMNS, formats)
+    return df
+
+
+def _convert_one(args):
+    path, out_dir, page_workers, cache_dir, profile, formats, page_store, name = args
+    try:
+        return path, convert_file(path, out_dir, page_workers, cache_dir, profile, formats, page_store, name), None
+    except Exception as exc:  # reported per file so one bad PDF does not abort the batch
+        return path, None, f'{type(exc).__name__}: {exc}'
+
+
+def run(
+    paths: list[Path],
+    out_dir: Path,
+    workers: int | None = None,
+    combined: str = 'combined.csv',
+    page_workers: int = 1,
+    cache_dir: str | None = None,
+    profile: str | None = None,
+    formats: Sequence[str] = ('csv',),
+    page_store: str | None = None,
+) -> int:
+    out_dir.mkdir(parents=True, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+
+    # A single large statement gets the whole pool at page level instead.
+    if len(paths) == 1 and page_workers == 1:
+        workers, page_workers = 1, workers
+
+    # A single statement's own file already holds every row
+    if len(paths) == 1:
+        combined = ''
+
+    names = source_names(paths)
+    outputs = output_names(names, reserved=(Path(combined).stem,) if combined else ())
+    jobs = [(p, out_dir, page_workers, cache_dir, profile, formats, page_store, outputs[p]) for p in paths]
+    frames = []
+    failures = 0
+    with ProcessPoolExecutor(max_workers=min(workers, len(paths))) as pool:
+        for path, df, error in pool.map(_convert_one, jobs):
+            if error:
+                failures += 1
+                print(f'{path}: {error}', file=sys.stderr)
+                continue
+            print(f'{path}: {len(df)} transactions')
+            frames.append(df.assign(**{SOURCE_COLUMN: names[path]}))
+
+    if combined and frames:
+        write_outputs(pd.concat(frames, ignore_index=True), out_dir / combined, [SOURCE_COLUMN] + CSV_COLUMNS, formats)
+    return 1 if failures else 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m converter', description='Convert bank statement PDFs to categorised CSV files.')
+    parser.add_argument('inputs', nargs='+', help='PDF files, directories or glob patterns')
+    parser.add_argument('-o', '--output', default='.', help='output directory (default: current directory)')
+    parser.add_argument('-j', '--workers', type=int, default=None, help='worker processes (default: one per CPU core)')
+    parser.add_argument('--page-workers', type=int, default=1, help='processes per statement for page-level parallelism (default: 1)')
+    parser.add_argument('--cache-dir', default=None, help='reuse results for PDFs already converted with the same rules')
+    parser.add_argument(
+        '--page-store', default=None,
+        help='SQLite file of parsed pages; pages seen in earlier statements are not extracted again',
+    )
+    parser.add_argument('--profile', choices=sorted(PROFILES), default=None, help='bank layout (default: detected from the first page)')
+    parser.add_argument('--combined', default='combined.csv', help="combined file name when converting more than one PDF, or '' to skip it")
+    parser.add_argument(
+        '--format', dest='formats', nargs='+', choices=sorted(WRITERS), default=['csv'],
+        help='output formats (default: csv); parquet and arrow need pyarrow, installed by requirements.txt',
+    )
+    args = parser.parse_args(argv)
+
+    # Fail before converting anything rather than once per statement
+    if {'parquet', 'arrow'} & set(args.formats):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            parser.error('--format parquet and arrow need pyarrow: pip install -r requirements.txt')
+
+    paths = find_pdfs(args.inputs)
+    if not paths:
+        parser.error('no PDF files found')
+    return run(paths, Path(args.output), args.workers, args.combined, args.page_workers, args.cache_dir, args.profile, args.formats, args.page_store)
@@ -0,0 +1,62 @@
+"""Typed Parquet and Arrow IPC export.
+
+Unlike the CSV, these keep column types: ``Date`` is a date, the
+low-cardinality text columns are dictionary encoded and the amounts are
+``decimal128(12, 2)`` with empty amounts as nulls, so nothing has to be
+re-parsed downstream. Needs ``pyarrow``, which is in requirements.txt.
+"""
+
+from __future__ import annotations
+
+from decimal import Decimal
+
+import pandas as pd
+
+from .extraction import AMOUNT_COLUMNS
+from .profiles import parse_dates
+
+# Columns written as dictionary arrays; any others not typed below are strings.
+DICTIONARY_COLUMNS = ('Source file', 'Transaction type', 'Category')
+
+
+def _pyarrow():
+    try:
+        import pyarrow as pa
+    except ImportError as exc:
+        raise ImportError('Parquet and Arrow export need pyarrow: pip install -r requirements.txt') from exc
+    return pa
+
+
+def to_arrow_table(df: pd.DataFrame, columns: list[str] | None = None):
+    """Convert extracted transactions to a typed ``pyarrow.Table``."""
+    pa = _pyarrow()
+    columns = list(df.columns) if columns is None else columns
+    amount_type = pa.decimal128(12, 2)
+
+    arrays = []
+    for column in columns:
+        values = df[column]
+        if column == 'Date':
+            arrays.append(pa.array(parse_dates(values).dt.date, type=pa.date32()))
+        elif column in AMOUNT_COLUMNS:
+            arrays.append(pa.array([Decimal(v) if isinstance(v, str) and v else None for v in values], type=amount_type))
+        elif column in DICTIONARY_COLUMNS:
+            arrays.append(pa.array(values, type=pa.string()).dictionary_encode())
+        else:
+            arrays.append(pa.array(values, type=pa.string()))
+    return pa.Table.from_arrays(arrays, names=columns)
+
+
+def write_parquet(df: pd.DataFrame, path, columns: list[str] | None = None) -> None:
+    table = to_arrow_table(df, columns)
+    import pyarrow.parquet as pq
+
+    pq.write_table(table, path, compression='zstd')
+
+
+def write_arrow(df: pd.DataFrame, path, columns: list[str] | None = None) -> None:
+    """Write an Arrow IPC file (Feather v2), readable with ``pyarrow.ipc.open_file``."""
+    pa = _pyarrow()
+    table = to_arrow_table(df, columns)
+    with pa.OSFile(str(path), 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
@@ -0,0 +1,45 @@
+"""CSV export matching ``convertToCSV`` in the browser."""
+
+from __future__ import annotations
+
+from typing import Iterator
+
+import pandas as pd
+
+# Rows per chunk yielded by ``iter_csv``.
+CHUNK_ROWS = 5000
+
+
+def _escape(value) -> str:
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return ''
+    value = str(value)
+    # Escape values that contain commas or quotes
+    if ',' in value or '"' in value or '\n' in value:
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+
+def iter_csv(df: pd.DataFrame, columns: list[str] | None = None, chunk_rows: int = CHUNK_ROWS) -> Iterator[str]:
+    """Yield the CSV text in chunks of ``chunk_rows`` rows, header first.
+
+    Suitable as the body of a streaming HTTP response; memory use is bounded by
+    one chunk rather than the whole file.
+    """
+    columns = list(df.columns) if columns is None else columns
+    yield ','.join(columns) + '\n'
+    for start in range(0, len(df), chunk_rows):
+        chunk = df[columns].iloc[start:start + chunk_rows]
+        yield ''.join(
+            ','.join(_escape(value) for value in row) + '\n'
+            for row in chunk.itertuples(index=False, name=None)
+        )
+
+
+def convert_to_csv(df: pd.DataFrame, columns: list[str] | None = None) -> str:
+    return ''.join(iter_csv(df, columns))
+
+
+def write_csv(df: pd.DataFrame, path, columns: list[str] | None = None) -> None:
+    with open(path, 'w', encoding='utf-8', newline='') as fh:
+        fh.writelines(iter_csv(df, columns))
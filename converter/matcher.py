@@ -0,0 +1,71 @@
+"""Aho-Corasick keyword matcher for the categorisation rules.
+
+``categorize_transaction`` used to test every keyword of every category
+against each description. ``KeywordMatcher`` compiles a ``{category:
+[keywords]}`` table once into a deterministic automaton and then finds the
+winning category in a single pass over the text, however many keywords
+there are.
+
+Priority is preserved: the original loop returns the first category, in
+table order, that has any keyword in the text, so each automaton state
+records the lowest category index among the keywords ending there and the
+scan keeps the minimum, stopping early once the first category is hit.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+
+_NO_MATCH = 1 << 30
+
+
+class KeywordMatcher:
+    def __init__(self, rules: dict[str, list[str]]):
+        self.categories = list(rules)
+
+        # Trie of keywords; ``best`` holds the lowest category index ending at a node.
+        goto: list[dict[str, int]] = [{}]
+        best = [_NO_MATCH]
+        for index, keywords in enumerate(rules.values()):
+            for keyword in keywords:
+                state = 0
+                for ch in keyword:
+                    nxt = goto[state].get(ch)
+                    if nxt is None:
+                        nxt = len(goto)
+                        goto[state][ch] = nxt
+                        goto.append({})
+                        best.append(_NO_MATCH)
+                    state = nxt
+                best[state] = min(best[state], index)
+
+        # Breadth-first pass: resolve failure links into a complete transition
+        # table and inherit matches from each state's longest proper suffix.
+        fail = [0] * len(goto)
+        delta = [dict(edges) for edges in goto]
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            best[state] = min(best[state], best[fail[state]])
+            for ch, nxt in goto[state].items():
+                fail[nxt] = delta[fail[state]].get(ch, 0)
+                queue.append(nxt)
+            for ch, nxt in delta[fail[state]].items():
+                delta[state].setdefault(ch, nxt)
+
+        self._delta = delta
+        self._best = best
+
+    def first_category(self, text: str) -> str | None:
+        """Return the highest-priority category with a keyword in ``text``."""
+        delta = self._delta
+        best = self._best
+        state = 0
+        found = _NO_MATCH
+        for ch in text:
+            state = delta[state].get(ch, 0)
+            if best[state] < found:
+                found = best[state]
+                if found == 0:
+                    break
+        return None if found == _NO_MATCH else self.categories[found]
@@ -0,0 +1,145 @@
+"""SQLite store of parsed rows per PDF page, for statements that repeat pages.
+
+Banks reissue statements as rolling PDFs, so most pages of a new upload have
+been parsed before. Each page is fingerprinted from its raw content stream and
+resources, which needs no text extraction, and its parsed rows are stored
+under that fingerprint and the statement layout. Re-running a statement then
+only extracts the pages the store has not seen. Rows are stored before
+categorisation, so changing the rules does not invalidate the store.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import time
+
+from pdfminer.pdftypes import PDFObjRef, PDFStream, resolve1
+
+from .profiles import BankProfile
+
+# Bump when the parsed rows change, in shape or in the rows a page gives, so
+# stale pages are ignored. 2: lines outside the learned columns kept.
+PAGE_STORE_FORMAT = 2
+
+DEFAULT_MAX_PAGES = 100_000
+
+# Parent would recurse into the page tree. Embedded font programs are kept:
+# re-subsetting already changes the hashed BaseFont tag, so leaving them out
+# saves little and lets two subsets that map glyphs differently collide.
+_SKIP_KEYS = frozenset({'Parent'})
+_MAX_DEPTH = 12
+
+
+def _canonical(obj, depth: int = 0):
+    """A document-independent form of a PDF object: references resolved, streams hashed."""
+    if depth > _MAX_DEPTH:
+        return None
+    if isinstance(obj, PDFObjRef):
+        obj = resolve1(obj)
+    if isinstance(obj, PDFStream):
+        return hashlib.sha256(obj.get_data()).hexdigest()
+    if isinstance(obj, dict):
+        return {str(k): _canonical(v, depth + 1) for k, v in sorted(obj.items()) if k not in _SKIP_KEYS}
+    if isinstance(obj, (list, tuple)):
+        return [_canonical(v, depth + 1) for v in obj]
+    return repr(obj)
+
+
+def page_fingerprint(page) -> str:
+    """SHA-256 of a pdfplumber page's content streams, resources and geometry.
+
+    Two pages with the same fingerprint produce the same text items, whichever
+    document they come from. The resources include the embedded font programs,
+    which pdfminer reads text from when a font has no ToUnicode or Encoding.
+    """
+    page_obj = page.page_obj
+    digest = hashlib.sha256()
+    contents = resolve1(page_obj.contents) or []
+    for stream in contents if isinstance(contents, list) else [contents]:
+        stream = resolve1(stream)
+        if isinstance(stream, PDFStream):
+            digest.update(stream.get_data())
+    digest.update(json.dumps([
+        _canonical(page_obj.resources),
+        list(page_obj.mediabox),
+        list(page_obj.cropbox),
+        page_obj.rotate,
+    ]).encode())
+    return digest.hexdigest()
+
+
+def layout_key(profile: BankProfile) -> str:
+    """Identify what a page's rows were parsed with: the profile and its columns."""
+    columns = sorted(profile.columns.items()) if profile.columns else None
+    return f'{profile.name}:{json.dumps(columns)}:v{PAGE_STORE_FORMAT}'
+
+
+class PageStore:
+    """Parsed rows by ``(page fingerprint, layout)``, evicted least-recently-used.
+
+    Safe to share between the processes of a batch run; SQLite serialises the
+    writes.
+    """
+
+    def __init__(self, path, max_pages: int = DEFAULT_MAX_PAGES):
+        self.path = str(path)
+        self.max_pages = max_pages
+        self._db = sqlite3.connect(self.path, timeout=30)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        with self._db:
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS pages ('
+                'fingerprint TEXT NOT NULL, layout TEXT NOT NULL, rows TEXT NOT NULL, last_used REAL NOT NULL, '
+                'PRIMARY KEY (fingerprint, layout))'
+            )
+            self._db.execute('CREATE INDEX IF NOT EXISTS pages_last_used ON pages (last_used)')
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __enter__(self) -> PageStore:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def get_many(self, fingerprints: list[str], profile: BankProfile) -> dict[str, list[dict]]:
+        """Return the stored rows for whichever of ``fingerprints`` are present."""
+        layout = layout_key(profile)
+        found = {}
+        unique = list(dict.fromkeys(fingerprints))
+        # Stay under SQLite's bound-parameter limit
+        for start in range(0, len(unique), 500):
+            batch = unique[start:start + 500]
+            marks = ','.join('?' * len(batch))
+            for fingerprint, rows in self._db.execute(
+                f'SELECT fingerprint, rows FROM pages WHERE layout = ? AND fingerprint IN ({marks})',
+                [layout, *batch],
+            ):
+                found[fingerprint] = json.loads(rows)
+        if found:
+            with self._db:
+                self._db.executemany(
+                    'UPDATE pages SET last_used = ? WHERE fingerprint = ? AND layout = ?',
+                    [(time.time(), fingerprint, layout) for fingerprint in found],
+                )
+        return found
+
+    def put_many(self, pages: dict[str, list[dict]], profile: BankProfile) -> None:
+        if not pages:
+            return
+        layout = layout_key(profile)
+        now = time.time()
+        with self._db:
+            self._db.executemany(
+                'INSERT OR REPLACE INTO pages (fingerprint, layout, rows, last_used) VALUES (?, ?, ?, ?)',
+                [(fingerprint, layout, json.dumps(rows, ensure_ascii=False), now) for fingerprint, rows in pages.items()],
+            )
+            (count,) = self._db.execute('SELECT COUNT(*) FROM pages').fetchone()
+            if count > self.max_pages:
+                self._db.execute(
+                    'DELETE FROM pages WHERE rowid IN (SELECT rowid FROM pages ORDER BY last_used LIMIT ?)',
+                    (count - self.max_pages,),
+                )
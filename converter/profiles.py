@@ -0,0 +1,276 @@
+"""Bank statement layouts.
+
+A ``BankProfile`` declares how one bank lays out its statement table: the date
+format, the transaction type vocabulary, detail fragments to drop, optional
+column x-ranges and which single-amount rows count as income. Everything it
+needs per line is compiled when the profile is built, so ``parse`` only scans
+tokens. Profiles are registered in ``PROFILES`` and chosen once per statement
+by ``detect_profile`` from the first page's text.
+
+``TIDE`` mirrors the Tide entry of ``BANK_PROFILES`` in ``streamlit_app.py``;
+keep the two in step.
+"""
+
+from __future__ import annotations
+
+import copy
+import re
+
+import pandas as pd
+
+AMOUNT_RE = re.compile(r'^\d+\.\d{2}$')
+
+# Keys of ``BankProfile.columns``
+COLUMNS = ('paid_in', 'paid_out', 'balance')
+
+PROFILES: dict[str, BankProfile] = {}
+
+
+class BankProfile:
+    """One bank's statement layout.
+
+    ``markers`` are phrases that identify the bank on the first page.
+    ``date_pattern`` must capture the date in group 1 and span at most
+    ``date_tokens`` text items; ``date_format`` is the ``strptime`` format of
+    that date, used by the typed exports. ``transaction_types`` are tried in order, so
+    longer names go before their prefixes. ``income_types`` are always income;
+    ``income_keywords`` maps a type to keywords that make a single-amount row
+    income. ``columns`` maps ``COLUMNS`` keys to ``[x0, x1)`` ranges; when not
+    fixed they are learned per statement from the labels in ``column_headers``
+    (see ``with_header_columns``), and without either, or on a line whose
+    balance falls outside them, amounts are told apart by how many a line has.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        markers: list[str],
+        date_pattern: str,
+        transaction_types: list[str],
+        income_types: list[str] | None = None,
+        income_keywords: dict[str, list[str]] | None = None,
+        skip_details: list[str] | None = None,
+        skip_tokens: list[str] | None = None,
+        columns: dict[str, tuple[float, float]] | None = None,
+        column_headers: dict[str, str] | None = None,
+        date_tokens: int = 3,
+        date_format: str = '%d %b %Y',
+    ):
+        self.name = name
+        self.markers = [marker.lower() for marker in markers]
+        self.date_re = re.compile(date_pattern)
+        self.date_tokens = date_tokens
+        self.date_format = date_format
+        self.transaction_types = list(transaction_types)
+        self.income_types = frozenset(income_types or ())
+        self.income_keywords = {t: [k.lower() for k in ks] for t, ks in (income_keywords or {}).items()}
+        self.skip_details = tuple(skip_details or ())
+        self.skip_tokens = frozenset(skip_tokens or ())
+        self._skip_re = re.compile('|'.join(map(re.escape, self.skip_details))) if self.skip_details else None
+        self.columns = dict(columns) if columns else None
+        self.column_headers = {c: label.lower() for c, label in (column_headers or {}).items()}
+
+        # (type, first word, word count) in priority order, and the distinct first words
+        self._type_words = [(t, t.split(' ')[0], len(t.split(' '))) for t in self.transaction_types]
+        self._first_words = list(dict.fromkeys(first for _, first, _ in self._type_words))
+
+    def __repr__(self) -> str:
+        return f'BankProfile({self.name!r})'
+
+    def matches(self, text: str) -> bool:
+        """Whether lowercase first-page ``text`` carries one of this bank's markers."""
+        return any(marker in text for marker in self.markers)
+
+    def with_header_columns(self, lines: list[list[dict]]) -> BankProfile:
+        """Return a copy of this profile with ``columns`` learned from a header row.
+
+        The header is the first line with an item starting with each
+        ``column_headers`` label. Each column runs from halfway to its left
+        neighbour's label to halfway to its right neighbour's; the leftmost
+        mirrors its right half and the rightmost runs to the page edge. Returns
+        ``self`` when the columns are fixed or no header is found.
+        """
+        if self.columns or not self.column_headers:
+            return self
+
+        for line in lines:
+            found = {}
+            for item in line:
+                text = item['text'].lower()
+                for column, label in self.column_headers.items():
+                    if column not in found and text.startswith(label):
+                        found[column] = item['x']
+            if len(found) == len(self.column_headers):
+                break
+        else:
+            return self
+
+        ordered = sorted(found.items(), key=lambda column: column[1])
+        xs = [x for _, x in ordered]
+        columns = {}
+        for i, (column, x) in enumerate(ordered):
+            if i > 0:
+                left = (xs[i - 1] + x) / 2
+            else:
+                left = x - (xs[1] - x) / 2 if len(xs) > 1 else 0
+            right = (x + xs[i + 1]) / 2 if i + 1 < len(xs) else float('inf')
+            columns[column] = (left, right)
+
+        profile = copy.copy(self)
+        profile.columns = columns
+        return profile
+
+    def column_at(self, x: float) -> str | None:
+        for column, (x0, x1) in self.columns.items():
+            if x0 <= x < x1:
+                return column
+        return None
+
+    def is_income(self, trans_type: str, all_text: list[str]) -> bool:
+        if trans_type in self.income_types:
+            return True
+        keywords = self.income_keywords.get(trans_type)
+        if not keywords:
+            return False
+        details_text = ' '.join(all_text).lower()
+        return any(k in details_text for k in keywords)
+
+    def parse(self, lines: list[list[dict]]) -> list[dict]:
+        """Parse transaction rows out of grouped lines.
+
+        Tokens are classified in one pass. Tokens are trimmed and non-empty, as
+        ``page_items`` and ``group_into_lines`` leave them, so only the first
+        ``date_tokens`` are joined for the date match; each token is then
+        checked once for the first word of a transaction type and for an
+        amount.
+        """
+        date_match_at = self.date_re.match
+        date_tokens = self.date_tokens
+        first_words = self._first_words
+        skip_re = self._skip_re
+        skip_tokens = self.skip_tokens
+
+        rows = []
+        for line in lines:
+            all_text = [item['text'] for item in line]
+
+            date_match = date_match_at(' '.join(all_text[:date_tokens]))
+            if not date_match:
+                continue
+
+            # First token containing each type's first word, and every amount
+            first_word_index = {}
+            numbers = []
+            for i, text in enumerate(all_text):
+                for word in first_words:
+                    if word not in first_word_index and word in text:
+                        first_word_index[word] = i
+                if ',' in text:
+                    text = text.replace(',', '')
+                if AMOUNT_RE.match(text):
+                    numbers.append((text, i))
+
+            trans_type = ''
+            trans_type_index = -1
+            for candidate, first_word, word_count in self._type_words:
+                idx = first_word_index.get(first_word, -1)
+                if idx != -1 and candidate in ' '.join(all_text[idx:idx + word_count]):
+                    trans_type = candidate
+                    trans_type_index = idx
+                    break
+
+            if not trans_type or len(numbers) < 2:
+                continue
+
+            paid_in = ''
+            paid_out = ''
+
+            # A line whose balance is outside the columns, say under a
+            # misplaced header label, is split by amount count instead
+            amounts = {}
+            if self.columns:
+                for text, i in numbers:
+                    column = self.column_at(line[i]['x'])
+                    if column:
+                        amounts.setdefault(column, text)
+
+            if 'balance' in amounts:
+                balance = amounts['balance']
+                paid_in = amounts.get('paid_in', '')
+                paid_out = amounts.get('paid_out', '')
+            else:
+                balance = numbers[-1][0]
+                if len(numbers) == 3:
+                    paid_in = numbers[0][0]
+                    paid_out = numbers[1][0]
+                elif len(numbers) == 2:
+                    if self.is_income(trans_type, all_text):
+                        paid_in = numbers[0][0]
+                    else:
+                        paid_out = numbers[0][0]
+
+            details = [
+                text for text in all_text[trans_type_index + 1:numbers[0][1]]
+                if text and text not in skip_tokens and not (skip_re and skip_re.search(text))
+            ]
+
+            rows.append({
+                'Date': date_match.group(1),
+                'Transaction type': trans_type,
+                'Details': ' '.join(' '.join(details).split()),
+                'Paid in (£)': paid_in,
+                'Paid out (£)': paid_out,
+                'Balance (£)': balance,
+            })
+        return rows
+
+
+def register_profile(profile: BankProfile) -> BankProfile:
+    PROFILES[profile.name] = profile
+    return profile
+
+
+def parse_dates(values: pd.Series) -> pd.Series:
+    """Parse statement dates with each registered profile's ``date_format``.
+
+    Formats are tried in registration order, so a frame combining statements
+    from several banks parses. Empty values become ``NaT``; a date no format
+    reads raises ``ValueError``.
+    """
+    text = values.fillna('').astype(str)
+    dates = pd.Series(pd.NaT, index=values.index, dtype='datetime64[ns]')
+    for date_format in dict.fromkeys(profile.date_format for profile in PROFILES.values()):
+        missing = dates.isna() & (text != '')
+        if not missing.any():
+            break
+        dates[missing] = pd.to_datetime(text[missing], format=date_format, errors='coerce')
+    unparsed = dates.isna() & (text != '')
+    if unparsed.any():
+        raise ValueError(f'no bank profile date format matches {text[unparsed].iloc[0]!r}')
+    return dates
+
+
+def detect_profile(text: str) -> BankProfile:
+    """Return the first registered profile whose markers appear in ``text``.
+
+    Falls back to ``TIDE``, the layout the converter was written for.
+    """
+    text = text.lower()
+    for profile in PROFILES.values():
+        if profile is not TIDE and profile.matches(text):
+            return profile
+    return TIDE
+
+
+TIDE = register_profile(BankProfile(
+    name='tide',
+    markers=['tide'],
+    date_pattern=r'^(\d{1,2}\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{4})',
+    date_format='%d %b %Y',
+    transaction_types=['Card Transaction Refund', 'Card Transaction', 'Domestic Transfer', 'Direct Debit', 'Fee'],
+    income_types=['Card Transaction Refund'],
+    income_keywords={'Domestic Transfer': ['sumup', 'paymentsense', 'evo payments', 'dojo', 'american express']},
+    skip_details=['Tide Card'],
+    skip_tokens=['****'],
+    column_headers={'paid_in': 'Paid in', 'paid_out': 'Paid out', 'balance': 'Balance'},
+))
@@ -0,0 +1,64 @@
+"""Category totals and trial balance, matching ``summarizeCategoryStats`` in
+``streamlit_app.py``.
+
+Money is integer pence throughout, so totals are exact and the trial balance
+balances without a tolerance.
+"""
+
+from __future__ import annotations
+
+import pandas as pd
+
+
+def to_pence(amounts: pd.Series) -> pd.Series:
+    """Integer pence from amount strings matching ``AMOUNT_RE``; empty is 0."""
+    digits = amounts.fillna('').astype(str).str.replace('.', '', regex=False)
+    return pd.to_numeric(digits, errors='coerce').fillna(0).astype('int64')
+
+
+def summarize(df: pd.DataFrame) -> dict:
+    """Summarise categorised transactions.
+
+    Returns ``income`` and ``expenses`` as ``(category, pence)`` pairs sorted
+    by amount, their totals, ``net_movement``, and ``trial_balance`` as
+    ``(section, [(account, debit, credit)])`` with ``None`` for an empty side,
+    followed by ``total_debit`` and ``total_credit``.
+    """
+    paid_in = to_pence(df['Paid in (£)'])
+    paid_out = to_pence(df['Paid out (£)'])
+
+    def totals(amounts: pd.Series) -> list[tuple[str, int]]:
+        by_category = amounts[amounts != 0].groupby(df['Category'], sort=False).sum()
+        return [(category, int(pence)) for category, pence in by_category.items()]
+
+    income = totals(paid_in)
+    expenses = totals(paid_out)
+    total_income = sum(pence for _, pence in income)
+    total_expenses = sum(pence for _, pence in expenses)
+    net_movement = total_income - total_expenses
+
+    def by_name(entries):
+        return sorted(entries, key=lambda entry: entry[0].casefold())
+
+    def by_amount(entries):
+        return sorted(entries, key=lambda entry: -entry[1])
+
+    # Income is credited and expenses debited; the bank account takes the net
+    # movement on whichever side balances them
+    bank = ('Bank Account', net_movement, None) if net_movement >= 0 else ('Bank Account', None, -net_movement)
+    trial_balance = [
+        ('INCOME', [(category, None, pence) for category, pence in by_name(income)]),
+        ('EXPENSES', [(category, pence, None) for category, pence in by_name(expenses)]),
+        ('ASSETS', [bank]),
+    ]
+
+    return {
+        'income': by_amount(income),
+        'expenses': by_amount(expenses),
+        'total_income': total_income,
+        'total_expenses': total_expenses,
+        'net_movement': net_movement,
+        'trial_balance': trial_balance,
+        'total_debit': total_expenses + max(net_movement, 0),
+        'total_credit': total_income + max(-net_movement, 0),
+    }
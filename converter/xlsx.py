@@ -0,0 +1,120 @@
+"""Excel export with openpyxl's write-only workbook.
+
+Rows are converted a chunk at a time and streamed into the sheets one at a
+time, so memory stays flat however long the statement is. The workbook has
+three sheets: the transactions, the category summary and the trial balance
+laid out like the browser's trial balance CSV.
+"""
+
+from __future__ import annotations
+
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+from openpyxl.utils import get_column_letter
+
+from .export import CHUNK_ROWS
+from .extraction import AMOUNT_COLUMNS
+from .profiles import parse_dates
+from .summary import summarize, to_pence
+
+AMOUNT_FORMAT = '#,##0.00'
+DATE_FORMAT = 'd mmm yyyy'
+
+_BOLD = Font(bold=True)
+
+# Column widths in characters, by header
+_WIDTHS = {
+    'Source file': 24,
+    'Date': 12,
+    'Transaction type': 22,
+    'Details': 48,
+    'Category': 28,
+    'Account': 32,
+}
+
+
+def _header(ws, headers: list[str]) -> None:
+    for i, header in enumerate(headers):
+        ws.column_dimensions[get_column_letter(i + 1)].width = _WIDTHS.get(header, 14)
+    ws.freeze_panes = 'A2'
+    row = []
+    for header in headers:
+        cell = WriteOnlyCell(ws, value=header)
+        cell.font = _BOLD
+        row.append(cell)
+    ws.append(row)
+
+
+def _amount(ws, pence: int | None, bold: bool = False):
+    cell = WriteOnlyCell(ws, value=None if pence is None else pence / 100)
+    cell.number_format = AMOUNT_FORMAT
+    if bold:
+        cell.font = _BOLD
+    return cell
+
+
+def _write_transactions(ws, df: pd.DataFrame, columns: list[str], chunk_rows: int = CHUNK_ROWS) -> None:
+    _header(ws, columns)
+
+    # Columns are converted a chunk at a time, as ``iter_csv`` walks the frame,
+    # so the Python values held at once are bounded by one chunk; amounts are
+    # pence, with None where the statement left the amount empty
+    for start in range(0, len(df), chunk_rows):
+        chunk = df.iloc[start:start + chunk_rows]
+        values = []
+        for column in columns:
+            if column == 'Date':
+                values.append(parse_dates(chunk[column]).dt.date.tolist())
+            elif column in AMOUNT_COLUMNS:
+                blank = chunk[column].fillna('') == ''
+                values.append(to_pence(chunk[column]).astype(object).mask(blank, None).tolist())
+            else:
+                values.append(chunk[column].fillna('').astype(str).tolist())
+
+        for row_values in zip(*values):
+            row = []
+            for column, value in zip(columns, row_values):
+                if column in AMOUNT_COLUMNS:
+                    row.append(_amount(ws, value))
+                elif column == 'Date':
+                    cell = WriteOnlyCell(ws, value=value)
+                    cell.number_format = DATE_FORMAT
+                    row.append(cell)
+                else:
+                    row.append(value)
+            ws.append(row)
+
+
+def _write_category_summary(ws, summary: dict) -> None:
+    _header(ws, ['Type', 'Category', 'Amount (£)'])
+    for label, key in (('Income', 'income'), ('Expense', 'expenses')):
+        for category, pence in summary[key]:
+            ws.append([label, category, _amount(ws, pence)])
+
+
+def _write_trial_balance(ws, summary: dict) -> None:
+    _header(ws, ['Account', 'Debit (£)', 'Credit (£)'])
+    ws.append(['Period transactions only (excluding opening balances)'])
+    ws.append([])
+    for title, accounts in summary['trial_balance']:
+        title_cell = WriteOnlyCell(ws, value=title)
+        title_cell.font = _BOLD
+        ws.append([title_cell])
+        for account, debit, credit in accounts:
+            ws.append([account, _amount(ws, debit), _amount(ws, credit)])
+        ws.append([])
+    total = WriteOnlyCell(ws, value='TOTAL')
+    total.font = _BOLD
+    ws.append([total, _amount(ws, summary['total_debit'], True), _amount(ws, summary['total_credit'], True)])
+
+
+def write_xlsx(df: pd.DataFrame, path, columns: list[str] | None = None) -> None:
+    columns = list(df.columns) if columns is None else columns
+    wb = Workbook(write_only=True)
+    _write_transactions(wb.create_sheet('Transactions'), df, columns)
+    summary = summarize(df)
+    _write_category_summary(wb.create_sheet('Category Summary'), summary)
+    _write_trial_balance(wb.create_sheet('Trial Balance'), summary)
+    wb.save(path)
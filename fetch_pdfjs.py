@@ -0,0 +1,88 @@
+"""Vendor the pinned pdf.js build into static/pdfjs/<version>/.
+
+    python fetch_pdfjs.py
+
+Run at deploy time, on a machine with network access, before the app is
+moved into an offline environment. ``streamlit_app.py`` serves the files
+from there instead of cdnjs once both are present. Each file is tried from
+cdnjs and then the npm CDNs, checked to be the pinned version, and written
+atomically, so an interrupted download never leaves a partial file for the
+app to serve.
+"""
+
+from __future__ import annotations
+
+import argparse
+import ast
+import os
+import sys
+import urllib.request
+from pathlib import Path
+
+ROOT = Path(__file__).parent
+FILES = ('pdf.min.js', 'pdf.worker.min.js')
+MIRRORS = (
+    'https://cdnjs.cloudflare.com/ajax/libs/pdf.js/{version}/{name}',
+    'https://cdn.jsdelivr.net/npm/pdfjs-dist@{version}/build/{name}',
+    'https://unpkg.com/pdfjs-dist@{version}/build/{name}',
+)
+
+
+def pinned_version() -> str:
+    """``PDFJS_VERSION`` from streamlit_app.py, read without running the app."""
+    tree = ast.parse((ROOT / 'streamlit_app.py').read_text(encoding='utf-8'))
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and getattr(node.targets[0], 'id', None) == 'PDFJS_VERSION':
+            return node.value.value
+    raise RuntimeError('PDFJS_VERSION not found in streamlit_app.py')
+
+
+def download(name: str, version: str) -> bytes:
+    errors = []
+    for mirror in MIRRORS:
+        url = mirror.format(version=version, name=name)
+        try:
+            with urllib.request.urlopen(url, timeout=60) as response:
+                data = response.read()
+        except OSError as exc:
+            errors.append(f'{url}: {exc}')
+            continue
+        # Builds embed their version; anything else is an error page or another release
+        if version.encode() not in data:
+            errors.append(f'{url}: not pdf.js {version}')
+            continue
+        return data
+    raise RuntimeError(f'could not download {name}:\n  ' + '\n  '.join(errors))
+
+
+def fetch(version: str, force: bool = False) -> Path:
+    target = ROOT / 'static' / 'pdfjs' / version
+    target.mkdir(parents=True, exist_ok=True)
+    for name in FILES:
+        path = target / name
+        if path.is_file() and not force:
+            print(f'{path}: present')
+            continue
+        data = download(name, version)
+        tmp = path.with_suffix(f'.{os.getpid()}.tmp')
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+        print(f'{path}: {len(data):,} bytes')
+    return target
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Download the pinned pdf.js files for offline use.')
+    parser.add_argument('--version', default=None, help='pdf.js version (default: PDFJS_VERSION in streamlit_app.py)')
+    parser.add_argument('--force', action='store_true', help='download again even if the files are present')
+    args = parser.parse_args()
+    try:
+        fetch(args.version or pinned_version(), args.force)
+    except RuntimeError as exc:
+        print(exc, file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
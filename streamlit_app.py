@@ -1,9 +1,20 @@
+from pathlib import Path
+
 import streamlit as st
 import streamlit.components.v1 as components
 
 # Set page config
 st.set_page_config(page_title="Bank Statement Converter", page_icon="🏦", layout="wide")
 
+# pdf.js is served from static/pdfjs/<version>/ through Streamlit static file
+# serving when vendored there, so startup needs no network; otherwise from cdnjs.
+PDFJS_VERSION = "3.11.174"
+PDFJS_DIR = Path(__file__).parent / "static" / "pdfjs" / PDFJS_VERSION
+if all((PDFJS_DIR / name).is_file() for name in ("pdf.min.js", "pdf.worker.min.js")):
+    PDFJS_BASE = f"app/static/pdfjs/{PDFJS_VERSION}"
+else:
+    PDFJS_BASE = f"https://cdnjs.cloudflare.com/ajax/libs/pdf.js/{PDFJS_VERSION}"
+
 # HTML content with categorization feature
 html_content = """
 <!DOCTYPE html>
@@ -12,6 +23,8 @@ html_content = """
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Bank Statement PDF to Excel Converter</title>
+    <link rel="preload" href="__PDFJS_BASE__/pdf.min.js" as="script">
+    <link rel="prefetch" href="__PDFJS_BASE__/pdf.worker.min.js">
     <style>
         * {
             margin: 0;
@@ -150,6 +163,19 @@ html_content = """
             font-size: 14px;
         }
 
+        .file-progress {
+            margin-bottom: 20px;
+        }
+
+        .file-name {
+            font-weight: 600;
+            color: #333;
+            margin-bottom: 8px;
+            overflow: hidden;
+            text-overflow: ellipsis;
+            white-space: nowrap;
+        }
+
         .result-section {
             display: none;
             margin-top: 30px;
@@ -307,6 +333,89 @@ html_content = """
             background: #f5f5f5;
         }
 
+        .grid-toolbar {
+            display: flex;
+            align-items: center;
+            gap: 15px;
+            margin-bottom: 10px;
+        }
+
+        .grid-toolbar h4 {
+            color: #667eea;
+        }
+
+        .grid-count {
+            color: #666;
+            font-size: 13px;
+            flex: 1;
+        }
+
+        .grid-filter {
+            padding: 8px 12px;
+            border: 1px solid #ccc;
+            border-radius: 5px;
+            font-size: 13px;
+            width: 260px;
+        }
+
+        .grid-date {
+            width: 150px;
+        }
+
+        .grid {
+            font-size: 13px;
+        }
+
+        .grid-row {
+            display: grid;
+            align-items: center;
+            height: 36px;
+            border-bottom: 1px solid #e0e0e0;
+        }
+
+        .grid-row > div {
+            padding: 0 10px;
+            overflow: hidden;
+            text-overflow: ellipsis;
+            white-space: nowrap;
+        }
+
+        .grid-header {
+            background: #667eea;
+            color: white;
+            font-weight: 600;
+        }
+
+        .grid-header > div {
+            cursor: pointer;
+            user-select: none;
+        }
+
+        .grid-viewport {
+            height: 432px;
+            overflow-y: auto;
+        }
+
+        .grid-spacer {
+            position: relative;
+        }
+
+        .grid-spacer .grid-row {
+            position: absolute;
+            top: 0;
+            left: 0;
+            right: 0;
+            background: white;
+        }
+
+        .grid-spacer .grid-row:hover {
+            background: #f5f5f5;
+        }
+
+        .grid-amount {
+            text-align: right;
+        }
+
         .download-btn {
             margin-top: 20px;
             width: 100%;
@@ -320,6 +429,28 @@ html_content = """
             background: #f8f9fa;
         }
 
+        .diagnostics {
+            margin-top: 20px;
+            font-size: 13px;
+        }
+
+        .diagnostics summary {
+            cursor: pointer;
+            color: #667eea;
+            font-weight: 600;
+        }
+
+        .diagnostics-actions {
+            display: flex;
+            gap: 10px;
+            margin-top: 10px;
+        }
+
+        .diagnostics-actions .btn {
+            font-size: 13px;
+            padding: 8px 20px;
+        }
+
         .chart-container {
             margin-top: 20px;
             padding: 20px;
@@ -339,19 +470,16 @@ html_content = """
         <div class="content">
             <div class="upload-section" id="uploadSection">
                 <div class="upload-icon">📄</div>
-                <h3>Drop your PDF file here</h3>
+                <h3>Drop your PDF files here</h3>
                 <p>or click to browse</p>
-                <input type="file" id="fileInput" accept=".pdf">
+                <input type="file" id="fileInput" accept=".pdf" multiple>
                 <button class="btn" onclick="document.getElementById('fileInput').click()">
-                    Select PDF File
+                    Select PDF Files
                 </button>
             </div>
 
             <div class="progress-section" id="progressSection">
-                <div class="progress-bar-container">
-                    <div class="progress-bar" id="progressBar">0%</div>
-                </div>
-                <div class="status-message" id="statusMessage">Processing...</div>
+                <div id="fileProgressList"></div>
             </div>
 
             <div class="error-message" id="errorMessage"></div>
@@ -411,9 +539,33 @@ html_content = """
                 </div>
 
                 <div class="preview-table">
-                    <h4 style="margin-bottom: 10px; color: #667eea;">Transaction Preview (First 10 rows)</h4>
-                    <table id="previewTable"></table>
+                    <div class="grid-toolbar">
+                        <h4>Transactions</h4>
+                        <span class="grid-count" id="gridCount"></span>
+                        <input type="search" class="grid-filter" id="gridFilter" placeholder="Search details...">
+                    </div>
+                    <div class="grid-toolbar">
+                        <select class="grid-filter" id="gridCategory"><option value="">All categories</option></select>
+                        <select class="grid-filter" id="gridType"><option value="">All transaction types</option></select>
+                        <input type="date" class="grid-filter grid-date" id="gridFrom" title="From date">
+                        <input type="date" class="grid-filter grid-date" id="gridTo" title="To date">
+                    </div>
+                    <div class="grid">
+                        <div class="grid-row grid-header" id="gridHeader"></div>
+                        <div class="grid-viewport" id="gridViewport">
+                            <div class="grid-spacer" id="gridSpacer"></div>
+                        </div>
+                    </div>
                 </div>
+
+                <details class="diagnostics" id="diagnosticsPanel">
+                    <summary>Diagnostics</summary>
+                    <div id="diagnosticsTable"></div>
+                    <div class="diagnostics-actions">
+                        <button class="btn" id="exportProfileBtn">Export timings (JSON)</button>
+                        <button class="btn" id="exportTraceBtn">Export Chrome trace</button>
+                    </div>
+                </details>
             </div>
         </div>
 
@@ -422,15 +574,10 @@ html_content = """
         </div>
     </div>
 
-    <script src="https://cdnjs.cloudflare.com/ajax/libs/pdf.js/3.11.174/pdf.min.js"></script>
-    <script>
-        pdfjsLib.GlobalWorkerOptions.workerSrc = 'https://cdnjs.cloudflare.com/ajax/libs/pdf.js/3.11.174/pdf.worker.min.js';
-
-        let extractedData = [];
-        let categoryStats = {
-            income: {},
-            expenses: {}
-        };
+    <script src="__PDFJS_BASE__/pdf.min.js"></script>
+    <script id="parserScript">
+        // Parsing and categorisation. Runs on the page and, from this same source,
+        // in the parser Web Worker so large statements do not block the UI.
 
         // Categorization rules
         const categories = {
@@ -460,353 +607,1689 @@ html_content = """
             }
         };
 
-        function categorizeTransaction(details, transType, paidIn, paidOut) {
-            const detailsLower = details.toLowerCase();
-            
-            // Determine if it's income or expense
-            const isIncome = paidIn !== '';
-            const categoryGroup = isIncome ? categories.income : categories.expenses;
-            
-            // Search through categories
-            for (const [categoryName, keywords] of Object.entries(categoryGroup)) {
-                for (const keyword of keywords) {
-                    if (detailsLower.includes(keyword)) {
-                        return categoryName;
+        // Categories for rows no keyword matched, by transaction type
+        const typeDefaults = {
+            income: { 'Card Transaction Refund': 'Refunds', 'Domestic Transfer': 'Bank Transfers' },
+            expenses: { 'Direct Debit': 'Utilities & Communications', 'Fee': 'Bank Fees & Charges' }
+        };
+        const defaultCategories = { income: 'Other Income', expenses: 'General Business Expenses' };
+
+        // Every table that decides a category, as hashed for the merchant memo
+        // and result cache keys; rules_version() in converter/categories.py
+        function rulesJSON() {
+            return JSON.stringify([categories, typeDefaults, defaultCategories]);
+        }
+
+        // Compile a { category: [keywords] } table into an Aho-Corasick automaton.
+        // The original scan returned the first category (in table order) with any
+        // keyword in the text, so each state keeps the lowest category index of
+        // the keywords ending there and the scan keeps the minimum.
+        function buildKeywordMatcher(rules) {
+            const names = Object.keys(rules);
+            const NO_MATCH = names.length;
+            const delta = [new Map()];
+            const best = [NO_MATCH];
+
+            names.forEach((name, index) => {
+                for (const keyword of rules[name]) {
+                    let state = 0;
+                    for (const ch of keyword) {
+                        let next = delta[state].get(ch);
+                        if (next === undefined) {
+                            next = delta.length;
+                            delta[state].set(ch, next);
+                            delta.push(new Map());
+                            best.push(NO_MATCH);
+                        }
+                        state = next;
                     }
+                    best[state] = Math.min(best[state], index);
+                }
+            });
+
+            // Breadth-first: resolve failure links into complete transitions
+            const fail = new Array(delta.length).fill(0);
+            const queue = Array.from(delta[0].values());
+            for (let head = 0; head < queue.length; head++) {
+                const state = queue[head];
+                best[state] = Math.min(best[state], best[fail[state]]);
+                const children = Array.from(delta[state]);
+                for (const [ch, next] of delta[fail[state]]) {
+                    if (!delta[state].has(ch)) delta[state].set(ch, next);
+                }
+                for (const [ch, next] of children) {
+                    fail[next] = delta[fail[state]].get(ch) || 0;
+                    queue.push(next);
                 }
             }
-            
-            // Default categories based on transaction type
-            if (isIncome) {
-                if (transType === 'Card Transaction Refund') return 'Refunds';
-                if (transType === 'Domestic Transfer') return 'Bank Transfers';
-                return 'Other Income';
-            } else {
-                if (transType === 'Direct Debit') return 'Utilities & Communications';
-                if (transType === 'Fee') return 'Bank Fees & Charges';
-                return 'General Business Expenses';
-            }
-        }
 
-        // CSV conversion functions
-        function convertToCSV(data) {
-            const headers = ['Date', 'Transaction type', 'Details', 'Category', 'Paid in (£)', 'Paid out (£)', 'Balance (£)'];
-            let csv = headers.join(',') + '\\n';
-            
-            data.forEach(row => {
-                const values = headers.map(header => {
-                    let value = row[header] || '';
-                    // Escape values that contain commas or quotes
-                    if (typeof value === 'string' && (value.includes(',') || value.includes('"') || value.includes('\\n'))) {
-                        value = '"' + value.replace(/"/g, '""') + '"';
+            return function firstCategory(text) {
+                let state = 0;
+                let found = NO_MATCH;
+                for (const ch of text) {
+                    state = delta[state].get(ch) || 0;
+                    if (best[state] < found) {
+                        found = best[state];
+                        if (found === 0) break;
                     }
-                    return value;
-                });
-                csv += values.join(',') + '\\n';
-            });
-            
-            return csv;
+                }
+                return found === NO_MATCH ? null : names[found];
+            };
         }
 
-        function downloadCSV(csvContent, filename) {
-            const blob = new Blob([csvContent], { type: 'text/csv;charset=utf-8;' });
-            const link = document.createElement('a');
-            if (link.download !== undefined) {
-                const url = URL.createObjectURL(blob);
-                link.setAttribute('href', url);
-                link.setAttribute('download', filename);
-                link.style.visibility = 'hidden';
-                document.body.appendChild(link);
-                link.click();
-                document.body.removeChild(link);
+        const categoryMatchers = {
+            income: buildKeywordMatcher(categories.income),
+            expenses: buildKeywordMatcher(categories.expenses)
+        };
+
+        // Merchant memo. Statements repeat the same merchants with a different
+        // reference, card mask or date each time, so Details is reduced to a
+        // merchant key by replacing each space-separated token of digits, '*', 'x'
+        // and separators (with at least one digit or '*') by '#', and the keyword
+        // scan runs once per key. No keyword contains '#' or a word made only of
+        // those characters, so the key matches exactly the keywords the full text
+        // does. Decisions are kept up to MERCHANT_MEMO_MAX keys, least recently
+        // used evicted first, and persisted in IndexedDB under a hash of the rules.
+        const MERCHANT_NOISE_RE = /(?:^|(?<= ))[\\d*x#\\/.:-]*[\\d*][\\d*x#\\/.:-]*(?= |$)/g;
+        const MERCHANT_MEMO_DB = 'bank-statement-merchants';
+        const MERCHANT_MEMO_MAX = 5000;
+        const merchantMemo = new Map();
+        let merchantClock = 0;
+        let merchantMemoLoad = null;
+        let merchantMemoDirty = false;
+
+        function merchantKey(details) {
+            return details.toLowerCase().replace(MERCHANT_NOISE_RE, '#').trim();
+        }
+
+        // First category in the group's table with a keyword in details, or null.
+        // Hits only stamp the entry; the Map itself changes on a miss.
+        function keywordCategory(group, details) {
+            const key = group + ':' + merchantKey(details);
+            let entry = merchantMemo.get(key);
+            if (entry === undefined) {
+                // Stamped before eviction, so the entry just computed is the newest
+                entry = { category: categoryMatchers[group](key.slice(group.length + 1)), lastUsed: ++merchantClock };
+                merchantMemo.set(key, entry);
+                merchantMemoDirty = true;
+                if (merchantMemo.size > MERCHANT_MEMO_MAX) evictMerchants();
+            } else {
+                entry.lastUsed = ++merchantClock;
+            }
+            return entry.category;
+        }
+
+        // Drop the least recently used quarter in one pass
+        function evictMerchants() {
+            let excess = merchantMemo.size - MERCHANT_MEMO_MAX * 3 / 4;
+            const cutoff = Float64Array.from(merchantMemo.values(), entry => entry.lastUsed).sort()[excess - 1];
+            for (const [key, entry] of merchantMemo) {
+                if (excess === 0) break;
+                if (entry.lastUsed <= cutoff) {
+                    merchantMemo.delete(key);
+                    excess--;
+                }
             }
         }
 
-        const fileInput = document.getElementById('fileInput');
-        const uploadSection = document.getElementById('uploadSection');
-        const progressSection = document.getElementById('progressSection');
-        const resultSection = document.getElementById('resultSection');
-        const errorMessage = document.getElementById('errorMessage');
-        const progressBar = document.getElementById('progressBar');
-        const statusMessage = document.getElementById('statusMessage');
-
-        uploadSection.addEventListener('dragover', (e) => {
-            e.preventDefault();
-            uploadSection.classList.add('dragover');
-        });
-
-        uploadSection.addEventListener('dragleave', () => {
-            uploadSection.classList.remove('dragover');
-        });
-
-        uploadSection.addEventListener('drop', (e) => {
-            e.preventDefault();
-            uploadSection.classList.remove('dragover');
-            const file = e.dataTransfer.files[0];
-            if (file && file.type === 'application/pdf') {
-                processPDF(file);
-            } else {
-                showError('Please upload a valid PDF file');
+        // FNV-1a of the rules, so a memo saved under other rules is ignored
+        function rulesHash() {
+            let hash = 0x811c9dc5;
+            for (const ch of rulesJSON()) {
+                hash = Math.imul(hash ^ ch.charCodeAt(0), 0x01000193);
             }
-        });
+            return (hash >>> 0).toString(16);
+        }
 
-        fileInput.addEventListener('change', (e) => {
-            const file = e.target.files[0];
-            if (file) {
-                processPDF(file);
+        function idbRequest(request) {
+            return new Promise((resolve, reject) => {
+                request.onsuccess = () => resolve(request.result);
+                request.onerror = () => reject(request.error);
+            });
+        }
+
+        function openMerchantMemo() {
+            const request = indexedDB.open(MERCHANT_MEMO_DB, 1);
+            request.onupgradeneeded = () => request.result.createObjectStore('memo');
+            return idbRequest(request);
+        }
+
+        // Starts loading the saved memo the first time rows are categorised; rows
+        // categorised before it arrives are scanned as usual. Storage failures
+        // leave the memo in memory only.
+        function loadMerchantMemo() {
+            if (merchantMemoLoad === null) {
+                merchantMemoLoad = (async () => {
+                    if (typeof indexedDB === 'undefined') return;
+                    const db = await openMerchantMemo();
+                    const saved = await idbRequest(db.transaction('memo').objectStore('memo').get(rulesHash()));
+                    // Saved keys count as older than any used this session
+                    for (const [key, category] of saved || []) {
+                        if (merchantMemo.size >= MERCHANT_MEMO_MAX) break;
+                        if (!merchantMemo.has(key)) merchantMemo.set(key, { category, lastUsed: 0 });
+                    }
+                })().catch(error => console.warn('Merchant memo unavailable:', error));
             }
-        });
+            return merchantMemoLoad;
+        }
 
-        async function processPDF(file) {
+        async function saveMerchantMemo() {
+            if (!merchantMemoDirty || typeof indexedDB === 'undefined') return;
+            merchantMemoDirty = false;
             try {
-                hideError();
-                resultSection.style.display = 'none';
-                progressSection.style.display = 'block';
-                updateProgress(10, 'Reading PDF file...');
-
-                const arrayBuffer = await file.arrayBuffer();
-                const pdf = await pdfjsLib.getDocument(arrayBuffer).promise;
-                
-                updateProgress(30, `Processing ${pdf.numPages} pages...`);
+                const db = await openMerchantMemo();
+                const store = db.transaction('memo', 'readwrite').objectStore('memo');
+                // One record per rules hash; older rules' records are dropped
+                await idbRequest(store.clear());
+                const entries = Array.from(merchantMemo, ([key, entry]) => [key, entry.category]);
+                await idbRequest(store.put(entries, rulesHash()));
+            } catch (error) {
+                console.warn('Merchant memo unavailable:', error);
+            }
+        }
 
-                extractedData = [];
-                categoryStats = { income: {}, expenses: {} };
+        function categorizeTransaction(details, transType, paidIn, paidOut) {
+            // Determine if it's income or expense
+            const isIncome = paidIn !== '';
 
-                for (let pageNum = 1; pageNum <= pdf.numPages; pageNum++) {
-                    const page = await pdf.getPage(pageNum);
-                    const textContent = await page.getTextContent();
-                    
-                    const items = textContent.items.map(item => ({
-                        text: item.str.trim(),
-                        x: Math.round(item.transform[4]),
-                        y: Math.round(item.transform[5]),
-                        height: Math.round(item.height)
-                    }));
-
-                    const lines = groupIntoLines(items);
-                    extractTableData(lines);
-                    
-                    const progress = 30 + (pageNum / pdf.numPages) * 50;
-                    updateProgress(progress, `Processing page ${pageNum} of ${pdf.numPages}...`);
-                }
+            // First category, in table order, with a keyword in the details
+            const group = isIncome ? 'income' : 'expenses';
+            const categoryName = keywordCategory(group, details);
+            if (categoryName !== null) {
+                return categoryName;
+            }
 
-                updateProgress(85, 'Categorizing transactions...');
-
-                // Add categories to extracted data
-                extractedData.forEach(row => {
-                    const category = categorizeTransaction(
-                        row['Details'],
-                        row['Transaction type'],
-                        row['Paid in (£)'],
-                        row['Paid out (£)']
-                    );
-                    row['Category'] = category;
-                    
-                    // Update category stats
-                    if (row['Paid in (£)']) {
-                        const amount = parseFloat(row['Paid in (£)']);
-                        categoryStats.income[category] = (categoryStats.income[category] || 0) + amount;
-                    }
-                    if (row['Paid out (£)']) {
-                        const amount = parseFloat(row['Paid out (£)']);
-                        categoryStats.expenses[category] = (categoryStats.expenses[category] || 0) + amount;
-                    }
-                });
+            // Default categories based on transaction type
+            return Object.hasOwn(typeDefaults[group], transType) ? typeDefaults[group][transType] : defaultCategories[group];
+        }
 
-                updateProgress(100, 'Complete!');
-                displayResults();
+        // Items are bucketed by baseline. Coordinates are rounded to whole points,
+        // so a page has far fewer distinct baselines than items, and the scan walks
+        // the buckets top to bottom, ending a line wherever the gap to the previous
+        // baseline exceeds yThreshold. Same lines as sorting every item by y, in
+        // near-linear time.
+        function groupIntoLines(items) {
+            const yThreshold = 5;
 
-            } catch (error) {
-                console.error('Error:', error);
-                showError('Error processing PDF: ' + error.message);
-                progressSection.style.display = 'none';
+            const buckets = new Map();
+            for (const item of items) {
+                if (item.text === '') continue;
+                const bucket = buckets.get(item.y);
+                if (bucket) {
+                    bucket.push(item);
+                } else {
+                    buckets.set(item.y, [item]);
+                }
             }
-        }
+            const baselines = Array.from(buckets.keys()).sort((a, b) => b - a);
 
-        function groupIntoLines(items) {
-            items.sort((a, b) => b.y - a.y);
-            
             const lines = [];
             let currentLine = [];
             let currentY = null;
-            const yThreshold = 5;
-            
-            items.forEach(item => {
-                if (item.text === '') return;
-                
-                if (currentY === null || Math.abs(item.y - currentY) <= yThreshold) {
-                    currentLine.push(item);
-                    currentY = item.y;
-                } else {
-                    if (currentLine.length > 0) {
-                        currentLine.sort((a, b) => a.x - b.x);
-                        lines.push(currentLine);
-                    }
-                    currentLine = [item];
-                    currentY = item.y;
+
+            for (const y of baselines) {
+                if (currentY !== null && currentY - y > yThreshold) {
+                    currentLine.sort((a, b) => a.x - b.x);
+                    lines.push(currentLine);
+                    currentLine = [];
                 }
-            });
-            
+                currentLine.push(...buckets.get(y));
+                currentY = y;
+            }
+
             if (currentLine.length > 0) {
                 currentLine.sort((a, b) => a.x - b.x);
                 lines.push(currentLine);
             }
-            
+
             return lines;
         }
 
-        function extractTableData(lines) {
-            for (let line of lines) {
-                const lineText = line.map(item => item.text).join(' ');
-                
-                const dateMatch = lineText.match(/^(\\d{1,2}\\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\\s+\\d{4})/);
-                
-                if (dateMatch) {
-                    const date = dateMatch[1];
+        // Bank statement layouts: date pattern and strptime-style dateFormat, type
+        // vocabulary, detail filters, amount columns and which single-amount rows
+        // are income. Column x-ranges ([x0, x1) for paidIn, paidOut and balance)
+        // are either fixed in columns or learned per statement from the
+        // columnHeaders labels; without either, or on a line whose balance falls
+        // outside them, amounts are told apart by how many a line has. Mirrors
+        // converter/profiles.py.
+        const BANK_PROFILES = [
+            {
+                name: 'tide',
+                markers: ['tide'],
+                dateRe: /^(\\d{1,2}\\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\\s+\\d{4})/,
+                dateTokens: 3,
+                dateFormat: '%d %b %Y',
+                transactionTypes: ['Card Transaction Refund', 'Card Transaction', 'Domestic Transfer', 'Direct Debit', 'Fee'],
+                incomeTypes: ['Card Transaction Refund'],
+                incomeKeywords: { 'Domestic Transfer': ['sumup', 'paymentsense', 'evo payments', 'dojo', 'american express'] },
+                skipDetails: ['Tide Card'],
+                skipTokens: ['****'],
+                columns: null,
+                columnHeaders: { paidIn: 'Paid in', paidOut: 'Paid out', balance: 'Balance' }
+            }
+        ];
+        const DEFAULT_PROFILE = 'tide';
+        const AMOUNT_RE = /^\\d+\\.\\d{2}$/;
+
+        // Compile a profile into a line parser. Tokens are classified in one
+        // pass. They are trimmed and non-empty, as readPageItems and
+        // groupIntoLines leave them, so only the first dateTokens are joined for
+        // the date match; each token is then checked once for the first word of
+        // a transaction type and for an amount.
+        function compileProfile(profile) {
+            const types = profile.transactionTypes.map(name => {
+                const words = name.split(' ');
+                return { name, first: words[0], wordCount: words.length };
+            });
+            const firstWords = [...new Set(types.map(type => type.first))];
+            types.forEach(type => { type.slot = firstWords.indexOf(type.first); });
+            const incomeTypes = new Set(profile.incomeTypes);
+            const skipTokens = new Set(profile.skipTokens);
+            const columns = profile.columns ? Object.entries(profile.columns) : null;
+
+            function columnAt(x) {
+                for (const [column, [x0, x1]] of columns) {
+                    if (x >= x0 && x < x1) return column;
+                }
+                return null;
+            }
+
+            function isIncome(transType, allText) {
+                if (incomeTypes.has(transType)) return true;
+                const keywords = profile.incomeKeywords[transType];
+                if (!keywords) return false;
+                const detailsText = allText.join(' ').toLowerCase();
+                return keywords.some(keyword => detailsText.includes(keyword));
+            }
+
+            return function parseLines(lines) {
+                const rows = [];
+                for (const line of lines) {
                     const allText = line.map(item => item.text);
-                    
-                    let transType = '';
-                    let transTypeIndex = -1;
-                    const types = ['Card Transaction Refund', 'Card Transaction', 'Domestic Transfer', 'Direct Debit', 'Fee'];
-                    
-                    for (let type of types) {
-                        const idx = allText.findIndex(t => t.includes(type.split(' ')[0]));
-                        if (idx !== -1) {
-                            const checkText = allText.slice(idx, idx + type.split(' ').length).join(' ');
-                            if (checkText.includes(type)) {
-                                transType = type;
-                                transTypeIndex = idx;
-                                break;
-                            }
-                        }
-                    }
-                    
-                    if (!transType) continue;
-                    
+
+                    const dateMatch = allText.slice(0, profile.dateTokens).join(' ').match(profile.dateRe);
+                    if (!dateMatch) continue;
+
+                    // First token containing each type's first word, and every amount
+                    const firstWordIndex = new Array(firstWords.length).fill(-1);
                     const numbers = [];
                     for (let i = 0; i < allText.length; i++) {
-                        const text = allText[i].replace(/,/g, '');
-                        if (/^\\d+\\.\\d{2}$/.test(text)) {
-                            numbers.push({ value: text, index: i });
+                        const text = allText[i];
+                        for (let w = 0; w < firstWords.length; w++) {
+                            if (firstWordIndex[w] === -1 && text.includes(firstWords[w])) firstWordIndex[w] = i;
+                        }
+                        const plain = text.includes(',') ? text.replace(/,/g, '') : text;
+                        if (AMOUNT_RE.test(plain)) {
+                            numbers.push({ value: plain, index: i });
                         }
                     }
-                    
-                    if (numbers.length < 2) continue;
-                    
-                    const balance = numbers[numbers.length - 1].value;
-                    
+
+                    let transType = '';
+                    let transTypeIndex = -1;
+                    for (const type of types) {
+                        const idx = firstWordIndex[type.slot];
+                        if (idx !== -1 && allText.slice(idx, idx + type.wordCount).join(' ').includes(type.name)) {
+                            transType = type.name;
+                            transTypeIndex = idx;
+                            break;
+                        }
+                    }
+
+                    if (!transType || numbers.length < 2) continue;
+
+                    let balance;
                     let paidIn = '';
                     let paidOut = '';
-                    
-                    if (numbers.length === 3) {
-                        paidIn = numbers[0].value;
-                        paidOut = numbers[1].value;
-                    } else if (numbers.length === 2) {
-                        const amount = numbers[0].value;
-                        
-                        const detailsText = allText.join(' ').toLowerCase();
-                        const isIncome = transType === 'Card Transaction Refund' || 
-                                       (transType === 'Domestic Transfer' && (
-                                           detailsText.includes('sumup') ||
-                                           detailsText.includes('paymentsense') ||
-                                           detailsText.includes('evo payments') ||
-                                           detailsText.includes('dojo') ||
-                                           detailsText.includes('american express')
-                                       ));
-                        
-                        if (isIncome) {
-                            paidIn = amount;
-                        } else {
-                            paidOut = amount;
+
+                    // A line whose balance is outside the columns, say under a
+                    // misplaced header label, is split by amount count instead
+                    const amounts = {};
+                    if (columns) {
+                        for (const number of numbers) {
+                            const column = columnAt(line[number.index].x);
+                            if (column && !(column in amounts)) amounts[column] = number.value;
                         }
                     }
-                    
-                    let details = [];
+
+                    if (amounts.balance !== undefined) {
+                        balance = amounts.balance;
+                        paidIn = amounts.paidIn || '';
+                        paidOut = amounts.paidOut || '';
+                    } else {
+                        balance = numbers[numbers.length - 1].value;
+                        if (numbers.length === 3) {
+                            paidIn = numbers[0].value;
+                            paidOut = numbers[1].value;
+                        } else if (numbers.length === 2) {
+                            if (isIncome(transType, allText)) {
+                                paidIn = numbers[0].value;
+                            } else {
+                                paidOut = numbers[0].value;
+                            }
+                        }
+                    }
+
+                    const details = [];
                     for (let i = transTypeIndex + 1; i < numbers[0].index; i++) {
-                        if (allText[i] && !allText[i].includes('Tide Card') && allText[i] !== '****') {
-                            details.push(allText[i]);
+                        const text = allText[i];
+                        if (text && !skipTokens.has(text) && !profile.skipDetails.some(skip => text.includes(skip))) {
+                            details.push(text);
                         }
                     }
-                    const detailsStr = details.join(' ').replace(/\\s+/g, ' ').trim();
-                    
-                    extractedData.push({
-                        'Date': date,
+
+                    rows.push({
+                        'Date': dateMatch[1],
                         'Transaction type': transType,
-                        'Details': detailsStr,
+                        'Details': details.join(' ').replace(/\\s+/g, ' ').trim(),
                         'Paid in (£)': paidIn,
                         'Paid out (£)': paidOut,
                         'Balance (£)': balance
                     });
                 }
-            }
+                return rows;
+            };
         }
 
-        function displayResults() {
-            progressSection.style.display = 'none';
-            resultSection.style.display = 'block';
+        // Compiled once per load, by profile name
+        const profileParsers = new Map(BANK_PROFILES.map(profile => [profile.name, compileProfile(profile)]));
 
-            let totalPaidIn = 0;
-            let totalPaidOut = 0;
+        // Pick the profile for a statement from its first page's items
+        function detectProfile(items) {
+            const text = items.map(item => item.text).join(' ').toLowerCase();
+            const profile = BANK_PROFILES.find(candidate =>
+                candidate.name !== DEFAULT_PROFILE && candidate.markers.some(marker => text.includes(marker)));
+            return profile || BANK_PROFILES.find(candidate => candidate.name === DEFAULT_PROFILE);
+        }
 
-            extractedData.forEach(row => {
-                if (row['Paid in (£)']) {
-                    totalPaidIn += parseFloat(row['Paid in (£)']);
-                }
-                if (row['Paid out (£)']) {
-                    totalPaidOut += parseFloat(row['Paid out (£)']);
+        // Learn column x-ranges from the first line with an item starting with
+        // each columnHeaders label. Each column runs from halfway to its left
+        // neighbour's label to halfway to its right neighbour's; the leftmost
+        // mirrors its right half and the rightmost runs to the page edge.
+        function learnColumns(profile, lines) {
+            if (profile.columns || !profile.columnHeaders) return null;
+            const labels = Object.entries(profile.columnHeaders).map(([column, label]) => [column, label.toLowerCase()]);
+
+            for (const line of lines) {
+                const found = {};
+                for (const item of line) {
+                    const text = item.text.toLowerCase();
+                    for (const [column, label] of labels) {
+                        if (found[column] === undefined && text.startsWith(label)) found[column] = item.x;
+                    }
                 }
-            });
+                if (Object.keys(found).length < labels.length) continue;
+
+                const ordered = Object.entries(found).sort((a, b) => a[1] - b[1]);
+                const columns = {};
+                ordered.forEach(([column, x], i) => {
+                    let left;
+                    if (i > 0) {
+                        left = (ordered[i - 1][1] + x) / 2;
+                    } else {
+                        left = ordered.length > 1 ? x - (ordered[1][1] - x) / 2 : 0;
+                    }
+                    const right = i + 1 < ordered.length ? (x + ordered[i + 1][1]) / 2 : Infinity;
+                    columns[column] = [left, right];
+                });
+                return columns;
+            }
+            return null;
+        }
 
-            const netProfit = totalPaidIn - totalPaidOut;
-            const totalCategories = Object.keys(categoryStats.income).length + Object.keys(categoryStats.expenses).length;
+        // Parser for one statement, given its first page's items and lines
+        function statementParser(items, lines) {
+            const profile = detectProfile(items);
+            const columns = learnColumns(profile, lines);
+            return columns ? compileProfile({ ...profile, columns }) : profileParsers.get(profile.name);
+        }
 
-            document.getElementById('totalTransactions').textContent = extractedData.length;
-            document.getElementById('totalPaidIn').textContent = '£' + totalPaidIn.toLocaleString('en-GB', {minimumFractionDigits: 2, maximumFractionDigits: 2});
-            document.getElementById('totalPaidOut').textContent = '£' + totalPaidOut.toLocaleString('en-GB', {minimumFractionDigits: 2, maximumFractionDigits: 2});
-            document.getElementById('totalCategories').textContent = totalCategories;
-            
-            const netProfitElement = document.getElementById('netProfit');
-            netProfitElement.textContent = '£' + netProfit.toLocaleString('en-GB', {minimumFractionDigits: 2, maximumFractionDigits: 2});
-            netProfitElement.style.color = netProfit >= 0 ? '#4CAF50' : '#f44336';
+        function extractTableData(lines, parseLines = profileParsers.get(DEFAULT_PROFILE)) {
+            return parseLines(lines);
+        }
 
-            // Display category summaries
-            displayCategorySummary('income', 'incomeCategories');
-            displayCategorySummary('expenses', 'expenseCategories');
-            
-            // Display trial balance
-            displayTrialBalance();
-
-            // Display preview table
-            const previewTable = document.getElementById('previewTable');
-            let tableHTML = '<thead><tr>';
-            const headers = ['Date', 'Transaction type', 'Details', 'Category', 'Paid in (£)', 'Paid out (£)', 'Balance (£)'];
-            headers.forEach(header => {
-                tableHTML += `<th>${header}</th>`;
+        function categorizeRows(rows) {
+            loadMerchantMemo();
+            rows.forEach(row => {
+                row['Category'] = categorizeTransaction(
+                    row['Details'],
+                    row['Transaction type'],
+                    row['Paid in (£)'],
+                    row['Paid out (£)']
+                );
             });
-            tableHTML += '</tr></thead><tbody>';
+        }
+
+        // Money is held as integer pence from here on. Amounts match AMOUNT_RE, so
+        // the pence come straight from the digits; a missing amount is 0
+        function toPence(amount) {
+            return amount ? Number(amount.slice(0, -3)) * 100 + Number(amount.slice(-2)) : 0;
+        }
+
+        // Column store for a run of rows: paid in, paid out and balance pence at
+        // 3i, 3i + 1 and 3i + 2. Float64Array holds integers exactly up to 2^53
+        // pence, well past what Int32Array would allow for a balance.
+        const AMOUNT_FIELDS = 3;
+
+        function rowAmounts(rows) {
+            const amounts = new Float64Array(rows.length * AMOUNT_FIELDS);
+            rows.forEach((row, i) => {
+                amounts[i * AMOUNT_FIELDS] = toPence(row['Paid in (£)']);
+                amounts[i * AMOUNT_FIELDS + 1] = toPence(row['Paid out (£)']);
+                amounts[i * AMOUNT_FIELDS + 2] = toPence(row['Balance (£)']);
+            });
+            return amounts;
+        }
+
+        function accumulateCategoryStats(rows, amounts, stats) {
+            rows.forEach((row, i) => {
+                const category = row['Category'];
+                const paidIn = amounts[i * AMOUNT_FIELDS];
+                const paidOut = amounts[i * AMOUNT_FIELDS + 1];
+                if (paidIn) {
+                    stats.income[category] = (stats.income[category] || 0) + paidIn;
+                }
+                if (paidOut) {
+                    stats.expenses[category] = (stats.expenses[category] || 0) + paidOut;
+                }
+            });
+            return stats;
+        }
+
+        function mergeCategoryStats(target, stats) {
+            for (const type of ['income', 'expenses']) {
+                for (const [category, amount] of Object.entries(stats[type])) {
+                    target[type][category] = (target[type][category] || 0) + amount;
+                }
+            }
+            return target;
+        }
+
+        // Stage timing, shared by the page and the parser worker. Times are epoch
+        // milliseconds (timeOrigin + now) so spans from both threads line up;
+        // heap is the page's JS heap after the stage where the browser reports it
+        const STAGE_THREAD = (typeof WorkerGlobalScope !== 'undefined' && self instanceof WorkerGlobalScope) ? 'parser' : 'main';
+
+        function clockNow() {
+            return performance.timeOrigin + performance.now();
+        }
+
+        function heapUsed() {
+            return (performance.memory && performance.memory.usedJSHeapSize) || null;
+        }
+
+        // Run fn, append its span to spans and return its result; argsOf maps the
+        // result to the counts recorded with the span
+        function timeStage(spans, name, fn, argsOf = () => ({})) {
+            const start = clockNow();
+            const result = fn();
+            spans.push({ name, thread: STAGE_THREAD, start, duration: clockNow() - start, heap: heapUsed(), args: argsOf(result) });
+            return result;
+        }
+
+        // Release parsed pages in page order, so row ordering and running balances
+        // stay correct, as soon as every earlier page is in; emit receives each
+        // page's categorised rows, their amounts in pence, the category totals
+        // and the timing spans for categorising and totalling them
+        function pageSequencer(emit) {
+            const pending = new Map();
+            let nextPage = 1;
+            return function pageParsed(pageNum, rows) {
+                pending.set(pageNum, rows);
+                while (pending.has(nextPage)) {
+                    const pageRows = pending.get(nextPage);
+                    pending.delete(nextPage);
+                    const page = nextPage++;
+                    const spans = [];
+                    const counts = () => ({ page, rows: pageRows.length });
+                    timeStage(spans, 'categorize', () => categorizeRows(pageRows), counts);
+                    const amounts = rowAmounts(pageRows);
+                    const stats = timeStage(spans, 'aggregate', () => accumulateCategoryStats(pageRows, amounts, { income: {}, expenses: {} }), counts);
+                    emit(pageRows, amounts, stats, spans);
+                }
+            };
+        }
+
+        // Inverse of readPageItems: NUL-separated UTF-8 text plus x, y, height triples
+        function unpackPageItems(page) {
+            const texts = new TextDecoder().decode(page.text).split('\\u0000');
+            const coords = new Int32Array(page.coords);
+            const items = [];
+            for (let i = 0; i < coords.length / 3; i++) {
+                items.push({
+                    text: texts[i],
+                    x: coords[i * 3],
+                    y: coords[i * 3 + 1],
+                    height: coords[i * 3 + 2]
+                });
+            }
+            return items;
+        }
+
+        // Worker side: pages arrive as transferable buffers and are parsed as they
+        // come, with the profile and its columns taken from the job's first page.
+        // Categorised rows go back a page at a time, in page order, as buffers.
+        if (typeof WorkerGlobalScope !== 'undefined' && self instanceof WorkerGlobalScope) {
+            const jobs = new Map();
+            const encoder = new TextEncoder();
+
+            self.onmessage = (e) => {
+                const message = e.data;
+                try {
+                    if (message.type === 'page') {
+                        const spans = [];
+                        const page = message.pageNum;
+                        const items = unpackPageItems(message);
+                        const lines = timeStage(spans, 'groupIntoLines', () => groupIntoLines(items),
+                            result => ({ page, items: items.length, lines: result.length }));
+                        const jobId = message.jobId;
+                        if (!jobs.has(jobId)) {
+                            jobs.set(jobId, {
+                                parseLines: statementParser(items, lines),
+                                pageParsed: pageSequencer((rows, amounts, stats, spans) => {
+                                    const buffer = encoder.encode(JSON.stringify(rows)).buffer;
+                                    self.postMessage(
+                                        { type: 'rows', jobId, rows: buffer, amounts: amounts.buffer, stats, spans },
+                                        [buffer, amounts.buffer]
+                                    );
+                                })
+                            });
+                        }
+                        const job = jobs.get(jobId);
+                        const rows = timeStage(spans, 'extractTableData', () => extractTableData(lines, job.parseLines),
+                            result => ({ page, rows: result.length }));
+                        self.postMessage({ type: 'page', jobId, pageNum: page, rowCount: rows.length, spans });
+                        job.pageParsed(page, rows);
+                    } else if (message.type === 'finish') {
+                        jobs.delete(message.jobId);
+                        saveMerchantMemo();
+                        self.postMessage({ type: 'done', jobId: message.jobId });
+                    } else if (message.type === 'cancel') {
+                        jobs.delete(message.jobId);
+                    }
+                } catch (error) {
+                    jobs.delete(message.jobId);
+                    self.postMessage({ type: 'error', jobId: message.jobId, message: error.message });
+                }
+            };
+        }
+    </script>
+    <script>
+        // Resolved against the page so the worker can be created from the same origin
+        pdfjsLib.GlobalWorkerOptions.workerSrc = new URL('__PDFJS_BASE__/pdf.worker.min.js', document.baseURI).href;
+
+        // Pages read concurrently by parseAndCategorize
+        const PAGE_CONCURRENCY = 4;
+        // Statements converted concurrently by processFiles
+        const FILE_CONCURRENCY = 2;
+
+        const textEncoder = new TextEncoder();
+        const textDecoder = new TextDecoder();
+
+        let extractedData = [];
+        let ledger = createLedger();
+        let sourceFileCount = 0;
+        let renderFrame = null;
+        // Bumped by each processFiles call; rows and results from an earlier,
+        // superseded run are dropped
+        let currentRun = 0;
+        let categoryStats = {
+            income: {},
+            expenses: {}
+        };
+        let summaryCache = null;
+
+        // Growable amount column store kept row-aligned with a list of rows; see
+        // rowAmounts for the layout
+        function createLedger(capacity = 1024) {
+            return { amounts: new Float64Array(capacity * AMOUNT_FIELDS), length: 0 };
+        }
+
+        function ledgerAppend(target, amounts) {
+            const needed = target.length * AMOUNT_FIELDS + amounts.length;
+            if (needed > target.amounts.length) {
+                const grown = new Float64Array(Math.max(needed, target.amounts.length * 2));
+                grown.set(target.amounts.subarray(0, target.length * AMOUNT_FIELDS));
+                target.amounts = grown;
+            }
+            target.amounts.set(amounts, target.length * AMOUNT_FIELDS);
+            target.length += amounts.length / AMOUNT_FIELDS;
+            return target;
+        }
+
+        function ledgerAmounts(source) {
+            return source.amounts.subarray(0, source.length * AMOUNT_FIELDS);
+        }
+
+        function penceToDecimal(pence) {
+            const sign = pence < 0 ? '-' : '';
+            const abs = Math.abs(pence);
+            return sign + Math.floor(abs / 100) + '.' + String(abs % 100).padStart(2, '0');
+        }
+
+        function formatPounds(pence) {
+            return (pence / 100).toLocaleString('en-GB', {minimumFractionDigits: 2, maximumFractionDigits: 2});
+        }
+
+        // CSV conversion functions
+        const CSV_HEADERS = ['Date', 'Transaction type', 'Details', 'Category', 'Paid in (£)', 'Paid out (£)', 'Balance (£)'];
+        const CSV_CHUNK_ROWS = 5000;
+
+        function escapeCSVValue(value) {
+            // Escape values that contain commas or quotes
+            if (typeof value === 'string' && (value.includes(',') || value.includes('"') || value.includes('\\n'))) {
+                return '"' + value.replace(/"/g, '""') + '"';
+            }
+            return value;
+        }
+
+        // Statements merged from several files lead with the file each row came from
+        function exportHeaders() {
+            return sourceFileCount > 1 ? ['Source file', ...CSV_HEADERS] : CSV_HEADERS;
+        }
+
+        // Build the CSV as an array of string parts, one per CSV_CHUNK_ROWS rows,
+        // so no single string grows with the size of the export
+        function convertToCSV(data, headers = exportHeaders()) {
+            const parts = [headers.join(',') + '\\n'];
+            for (let start = 0; start < data.length; start += CSV_CHUNK_ROWS) {
+                const lines = [];
+                const end = Math.min(start + CSV_CHUNK_ROWS, data.length);
+                for (let i = start; i < end; i++) {
+                    const row = data[i];
+                    lines.push(headers.map(header => escapeCSVValue(row[header] || '')).join(',') + '\\n');
+                }
+                parts.push(lines.join(''));
+            }
+            return parts;
+        }
+
+        function downloadCSV(csvParts, filename) {
+            downloadFile(csvParts, 'text/csv;charset=utf-8;', filename);
+        }
+
+        function downloadFile(parts, type, filename) {
+            const blob = new Blob(parts, { type });
+            const link = document.createElement('a');
+            if (link.download !== undefined) {
+                const url = URL.createObjectURL(blob);
+                link.setAttribute('href', url);
+                link.setAttribute('download', filename);
+                link.style.visibility = 'hidden';
+                document.body.appendChild(link);
+                link.click();
+                document.body.removeChild(link);
+                setTimeout(() => URL.revokeObjectURL(url), 0);
+            }
+        }
+
+        const fileInput = document.getElementById('fileInput');
+        const uploadSection = document.getElementById('uploadSection');
+        const progressSection = document.getElementById('progressSection');
+        const resultSection = document.getElementById('resultSection');
+        const errorMessage = document.getElementById('errorMessage');
+        const fileProgressList = document.getElementById('fileProgressList');
+
+        uploadSection.addEventListener('dragover', (e) => {
+            e.preventDefault();
+            uploadSection.classList.add('dragover');
+        });
+
+        uploadSection.addEventListener('dragleave', () => {
+            uploadSection.classList.remove('dragover');
+        });
+
+        uploadSection.addEventListener('drop', (e) => {
+            e.preventDefault();
+            uploadSection.classList.remove('dragover');
+            const files = Array.from(e.dataTransfer.files).filter(file => file.type === 'application/pdf');
+            if (files.length > 0) {
+                processFiles(files);
+            } else {
+                showError('Please upload a valid PDF file');
+            }
+        });
+
+        fileInput.addEventListener('change', (e) => {
+            const files = Array.from(e.target.files);
+            if (files.length > 0) {
+                processFiles(files);
+            }
+        });
+
+        // Convert several statements through a bounded-concurrency queue. Rows are
+        // shown and totalled as each page completes; once every file is done they
+        // are put back in selection order
+        async function processFiles(files) {
+            hideError();
+            resultSection.style.display = 'none';
+            progressSection.style.display = 'block';
+            fileProgressList.innerHTML = '';
+
+            const run = ++currentRun;
+            cancelParserJobs();
+            extractedData = [];
+            ledger = createLedger();
+            categoryStats = { income: {}, expenses: {} };
+            summaryCache = null;
+            sourceFileCount = files.length;
+            // This run's own span list, so stages still finishing for an earlier
+            // run land in that run's list rather than this one
+            const spans = stageSpans = [];
+            const runStart = clockNow();
+            const onRows = (rows, amounts, stats) => {
+                if (run === currentRun) appendRows(rows, amounts, stats);
+            };
+
+            const trackers = files.map(file => createFileProgress(file.name));
+            const results = new Array(files.length);
+            const failures = [];
+            let next = 0;
+
+            async function runQueue() {
+                while (next < files.length && run === currentRun) {
+                    const index = next++;
+                    try {
+                        results[index] = await processPDF(files[index], trackers[index], onRows, run, spans);
+                    } catch (error) {
+                        console.error('Error:', error);
+                        trackers[index](100, 'Failed: ' + error.message);
+                        failures.push(`${files[index].name}: ${error.message}`);
+                    }
+                }
+            }
+            await Promise.all(Array.from({ length: Math.min(FILE_CONCURRENCY, files.length) }, runQueue));
+            if (run !== currentRun) return;
+
+            if (renderFrame !== null) {
+                cancelAnimationFrame(renderFrame);
+                renderFrame = null;
+            }
+            progressSection.style.display = 'none';
+            const converted = results.filter(result => result);
+            if (failures.length > 0) {
+                showError('Error processing PDF: ' + failures.join('; '));
+            }
+            if (converted.length === 0) {
+                resultSection.style.display = 'none';
+                return;
+            }
+
+            spans.push({ name: 'processFiles', thread: 'main', async: true, start: runStart, duration: clockNow() - runStart, heap: heapUsed(), args: { files: files.length } });
+
+            // Rebuild from the files that converted, dropping rows streamed from any that failed
+            extractedData = [].concat(...converted.map(result => result.rows));
+            ledger = createLedger(extractedData.length);
+            converted.forEach(result => ledgerAppend(ledger, ledgerAmounts(result.ledger)));
+            sourceFileCount = converted.length;
+            categoryStats = { income: {}, expenses: {} };
+            converted.forEach(result => mergeCategoryStats(categoryStats, result.stats));
+            summaryCache = null;
+
+            displayResults();
+            if (diagnosticsPanel.open) renderDiagnostics();
+        }
+
+        // Add rows that have just been categorised and schedule a repaint
+        function appendRows(rows, amounts, stats) {
+            for (const row of rows) extractedData.push(row);
+            ledgerAppend(ledger, amounts);
+            mergeCategoryStats(categoryStats, stats);
+            summaryCache = null;
+            if (renderFrame === null) {
+                renderFrame = requestAnimationFrame(() => {
+                    renderFrame = null;
+                    displayResults();
+                });
+            }
+        }
 
-            extractedData.slice(0, 10).forEach(row => {
-                tableHTML += '<tr>';
-                headers.forEach(header => {
-                    const value = row[header] || '';
-                    tableHTML += `<td>${value}</td>`;
+        async function processPDF(file, updateProgress, onRows, run, spans) {
+            updateProgress(10, 'Reading PDF file...');
+            let cacheKey = null;
+
+            const label = { file: file.name };
+            const arrayBuffer = await timeStageAsync(spans, 'readFile', () => file.arrayBuffer(), label, buffer => ({ bytes: buffer.byteLength }));
+
+            // Hash before pdf.js takes ownership of the buffer
+            const cachedRows = await timeStageAsync(spans, 'cacheLookup', async () => {
+                cacheKey = await resultCacheKey(arrayBuffer);
+                return resultCacheGet(cacheKey);
+            }, label, rows => ({ hit: Boolean(rows) }));
+
+            const emitRows = (rows, amounts, stats) => {
+                rows.forEach(row => {
+                    row['Source file'] = file.name;
                 });
-                tableHTML += '</tr>';
+                onRows(rows, amounts, stats);
+            };
+
+            let result;
+            if (cachedRows) {
+                const amounts = rowAmounts(cachedRows);
+                result = {
+                    rows: cachedRows,
+                    ledger: ledgerAppend(createLedger(cachedRows.length), amounts),
+                    stats: accumulateCategoryStats(cachedRows, amounts, { income: {}, expenses: {} })
+                };
+                emitRows(result.rows, amounts, result.stats);
+                updateProgress(85, 'Loaded previous results for this file...');
+            } else {
+                result = await parseAndCategorize(arrayBuffer, updateProgress, emitRows, label, run, spans);
+                await timeStageAsync(spans, 'cacheStore', () => resultCachePut(cacheKey, result.rows), label);
+            }
+
+            updateProgress(100, 'Complete!');
+            return result;
+        }
+
+        async function parseAndCategorize(arrayBuffer, updateProgress, onRows, label, run, spans) {
+            const pdf = await timeStageAsync(spans, 'loadPDF', () => pdfjsLib.getDocument(arrayBuffer).promise, label, doc => ({ pages: doc.numPages }));
+
+            updateProgress(30, `Processing ${pdf.numPages} pages...`);
+
+            // Progress follows the parser, which reports each page once its rows are extracted
+            let pagesDone = 0;
+            const job = startParserJob(() => {
+                pagesDone++;
+                const progress = 30 + (pagesDone / pdf.numPages) * 50;
+                updateProgress(progress, `Processing page ${pagesDone} of ${pdf.numPages}...`);
+            }, onRows, label, spans);
+
+            // The parser picks the bank profile and learns the amount columns from
+            // the first page it receives, so page 1 goes first; the rest are read in
+            // bounded concurrent batches and the parser releases their rows in page
+            // order. A newer run stops the reading between batches.
+            try {
+                job.addPage(1, await readPageItems(pdf, 1, label, spans));
+                for (let start = 2; start <= pdf.numPages; start += PAGE_CONCURRENCY) {
+                    if (run !== currentRun) throw new Error(SUPERSEDED);
+                    const end = Math.min(start + PAGE_CONCURRENCY - 1, pdf.numPages);
+                    const batch = [];
+                    for (let pageNum = start; pageNum <= end; pageNum++) {
+                        batch.push(readPageItems(pdf, pageNum, label, spans).then(packed => job.addPage(pageNum, packed)));
+                    }
+                    await Promise.all(batch);
+                }
+            } catch (error) {
+                job.cancel();
+                throw error;
+            }
+
+            updateProgress(85, 'Categorizing transactions...');
+            return job.finish();
+        }
+
+        async function readPageItems(pdf, pageNum, label, spans) {
+            const textContent = await timeStageAsync(spans, 'getTextContent', async () => {
+                const page = await pdf.getPage(pageNum);
+                return page.getTextContent();
+            }, { ...label, page: pageNum }, content => ({ items: content.items.length }));
+
+            // Pack the items into transferable buffers for the parser
+            const coords = new Int32Array(textContent.items.length * 3);
+            const texts = textContent.items.map((item, i) => {
+                coords[i * 3] = Math.round(item.transform[4]);
+                coords[i * 3 + 1] = Math.round(item.transform[5]);
+                coords[i * 3 + 2] = Math.round(item.height);
+                return item.str.trim();
+            });
+
+            return { text: textEncoder.encode(texts.join('\\u0000')).buffer, coords: coords.buffer };
+        }
+
+        // Parser Web Worker built from the parserScript source; null when workers
+        // are unavailable, in which case jobs parse on the page instead
+        const parserWorker = createParserWorker();
+        const parserJobs = new Map();
+        let nextParserJobId = 1;
+
+        function createParserWorker() {
+            try {
+                const source = document.getElementById('parserScript').textContent;
+                const worker = new Worker(URL.createObjectURL(new Blob([source], { type: 'text/javascript' })));
+                worker.onmessage = (e) => {
+                    const message = e.data;
+                    const job = parserJobs.get(message.jobId);
+                    if (!job) return;
+                    if (message.spans) recordSpans(job.spans, message.spans, job.label);
+                    if (message.type === 'page') {
+                        job.onPage(message.pageNum, message.rowCount);
+                        return;
+                    }
+                    if (message.type === 'rows') {
+                        job.onRows(JSON.parse(textDecoder.decode(message.rows)), new Float64Array(message.amounts), message.stats);
+                        return;
+                    }
+                    parserJobs.delete(message.jobId);
+                    if (message.type === 'done') {
+                        job.resolve();
+                    } else {
+                        job.reject(new Error(message.message));
+                    }
+                };
+                worker.onerror = (e) => {
+                    parserJobs.forEach(job => job.reject(new Error(e.message || 'Parser worker failed')));
+                    parserJobs.clear();
+                };
+                return worker;
+            } catch (error) {
+                console.warn('Parser worker unavailable, parsing on the page:', error);
+                return null;
+            }
+        }
+
+        const SUPERSEDED = 'Superseded by a newer conversion';
+
+        // Stop the worker's jobs for an earlier run, so they neither compete with
+        // the new run for the worker nor report into it
+        function cancelParserJobs() {
+            parserJobs.forEach((job, jobId) => {
+                parserWorker.postMessage({ type: 'cancel', jobId });
+                job.reject(new Error(SUPERSEDED));
             });
-            tableHTML += '</tbody>';
-            previewTable.innerHTML = tableHTML;
+            parserJobs.clear();
+        }
+
+        // One statement's parse: pages go in as they are read, onRows receives each
+        // page's categorised rows, amounts and category totals in page order as
+        // soon as they are ready, and finish() resolves to all of them. Stage
+        // spans go to runSpans, the list of the run that started the job.
+        function startParserJob(onPage, onRows, label, runSpans) {
+            const result = { rows: [], ledger: createLedger(), stats: { income: {}, expenses: {} } };
+            const collect = (rows, amounts, stats, spans) => {
+                // Spans arrive here only when parsing inline; the worker's come with its messages
+                if (spans) recordSpans(runSpans, spans, label);
+                for (const row of rows) result.rows.push(row);
+                ledgerAppend(result.ledger, amounts);
+                mergeCategoryStats(result.stats, stats);
+                onRows(rows, amounts, stats);
+            };
+
+            if (!parserWorker) {
+                const pageParsed = pageSequencer(collect);
+                let parseLines = null;
+                return {
+                    addPage(pageNum, packed) {
+                        const spans = [];
+                        const items = unpackPageItems(packed);
+                        const lines = timeStage(spans, 'groupIntoLines', () => groupIntoLines(items),
+                            result => ({ page: pageNum, items: items.length, lines: result.length }));
+                        parseLines = parseLines || statementParser(items, lines);
+                        const rows = timeStage(spans, 'extractTableData', () => extractTableData(lines, parseLines),
+                            result => ({ page: pageNum, rows: result.length }));
+                        recordSpans(runSpans, spans, label);
+                        onPage(pageNum, rows.length);
+                        pageParsed(pageNum, rows);
+                    },
+                    finish: async () => {
+                        saveMerchantMemo();
+                        return result;
+                    },
+                    cancel() {}
+                };
+            }
+
+            const jobId = nextParserJobId++;
+            const done = new Promise((resolve, reject) => parserJobs.set(jobId, {
+                resolve: () => resolve(result),
+                reject,
+                onPage,
+                onRows: collect,
+                label,
+                spans: runSpans
+            }));
+            done.catch(() => {});  // surfaced by finish()
+            return {
+                // A cancelled job is already rejected; posting more pages would
+                // start it again in the worker
+                addPage(pageNum, packed) {
+                    if (!parserJobs.has(jobId)) return;
+                    parserWorker.postMessage({ type: 'page', jobId, pageNum, ...packed }, [packed.text, packed.coords]);
+                },
+                finish() {
+                    if (parserJobs.has(jobId)) parserWorker.postMessage({ type: 'finish', jobId });
+                    return done;
+                },
+                cancel() {
+                    parserJobs.delete(jobId);
+                    parserWorker.postMessage({ type: 'cancel', jobId });
+                }
+            };
         }
 
-        function displayCategorySummary(type, elementId) {
-            const container = document.getElementById(elementId);
-            const stats = categoryStats[type];
+        // Stage spans for the current run, from the page and the parser worker.
+        // They feed the diagnostics panel and export as JSON or as a Chrome trace
+        // (load it in chrome://tracing or Perfetto).
+        const STAGE_ORDER = [
+            'processFiles', 'readFile', 'cacheLookup', 'loadPDF', 'getTextContent', 'groupIntoLines',
+            'extractTableData', 'categorize', 'aggregate', 'cacheStore', 'render'
+        ];
+        const diagnosticsPanel = document.getElementById('diagnosticsPanel');
+        let stageSpans = [];
+
+        function recordSpans(target, spans, args) {
+            for (const span of spans) {
+                target.push({ ...span, args: { ...args, ...span.args } });
+            }
+        }
+
+        // Async stages can overlap one another, so they are marked and exported
+        // as async trace events rather than nested slices
+        async function timeStageAsync(spans, name, fn, args = {}, argsOf = () => ({})) {
+            const start = clockNow();
+            const result = await fn();
+            spans.push({
+                name, thread: 'main', async: true, start, duration: clockNow() - start, heap: heapUsed(),
+                args: { ...args, ...argsOf(result) }
+            });
+            return result;
+        }
+
+        // Per-stage totals: calls, wall time and the item/row counts processed
+        function summarizeSpans(spans) {
+            const stages = new Map(STAGE_ORDER.map(name => [name, null]));
+            for (const span of spans) {
+                const key = span.name;
+                const stage = stages.get(key) || { name: key, thread: span.thread, calls: 0, total: 0, max: 0, items: 0, rows: 0 };
+                stage.calls++;
+                stage.total += span.duration;
+                stage.max = Math.max(stage.max, span.duration);
+                stage.items += span.args.items || 0;
+                stage.rows += span.args.rows || 0;
+                stages.set(key, stage);
+            }
+            return Array.from(stages.values()).filter(stage => stage);
+        }
+
+        function renderDiagnostics() {
+            const container = document.getElementById('diagnosticsTable');
+            const ms = value => value.toLocaleString('en-GB', { maximumFractionDigits: 1 });
+            let html = '<table style="width: 100%; margin-top: 10px;"><thead><tr>';
+            html += '<th>Stage</th><th>Thread</th><th>Calls</th><th>Total (ms)</th><th>Mean (ms)</th><th>Max (ms)</th><th>Items</th><th>Rows</th>';
+            html += '</tr></thead><tbody>';
+            summarizeSpans(stageSpans).forEach(stage => {
+                html += `<tr>
+                    <td>${stage.name}</td>
+                    <td>${stage.thread}</td>
+                    <td style="text-align: right;">${stage.calls}</td>
+                    <td style="text-align: right;">${ms(stage.total)}</td>
+                    <td style="text-align: right;">${ms(stage.total / stage.calls)}</td>
+                    <td style="text-align: right;">${ms(stage.max)}</td>
+                    <td style="text-align: right;">${stage.items || ''}</td>
+                    <td style="text-align: right;">${stage.rows || ''}</td>
+                </tr>`;
+            });
+            html += '</tbody></table>';
+
+            const heaps = stageSpans.map(span => span.heap).filter(heap => heap);
+            if (heaps.length > 0) {
+                html += `<p style="margin-top: 10px; color: #666;">Peak JS heap: ${(Math.max(...heaps) / 1048576).toFixed(1)} MiB</p>`;
+            }
+            container.innerHTML = html;
+        }
+
+        function chromeTrace(spans) {
+            const origin = Math.min(...spans.map(span => span.start));
+            const threads = { main: 1, parser: 2 };
+            const events = [
+                { name: 'thread_name', ph: 'M', pid: 1, tid: 1, args: { name: 'Main thread' } },
+                { name: 'thread_name', ph: 'M', pid: 1, tid: 2, args: { name: 'Parser worker' } }
+            ];
+            spans.forEach((span, id) => {
+                const event = {
+                    name: span.name,
+                    cat: 'converter',
+                    pid: 1,
+                    tid: threads[span.thread],
+                    args: span.heap ? { ...span.args, heap: span.heap } : span.args
+                };
+                const ts = (span.start - origin) * 1000;
+                if (span.async) {
+                    events.push({ ...event, ph: 'b', id, ts }, { ...event, ph: 'e', id, ts: ts + span.duration * 1000 });
+                } else {
+                    events.push({ ...event, ph: 'X', ts, dur: span.duration * 1000 });
+                }
+            });
+            return { traceEvents: events, displayTimeUnit: 'ms' };
+        }
+
+        diagnosticsPanel.addEventListener('toggle', () => {
+            if (diagnosticsPanel.open) renderDiagnostics();
+        });
+
+        document.getElementById('exportProfileBtn').addEventListener('click', () => {
+            const profile = { userAgent: navigator.userAgent, stages: summarizeSpans(stageSpans), spans: stageSpans };
+            downloadFile([JSON.stringify(profile, null, 2)], 'application/json', 'converter_timings.json');
+        });
+
+        document.getElementById('exportTraceBtn').addEventListener('click', () => {
+            if (stageSpans.length === 0) return;
+            downloadFile([JSON.stringify(chromeTrace(stageSpans))], 'application/json', 'converter_trace.json');
+        });
+
+        // Result cache: categorised rows in IndexedDB keyed by SHA-256 of the PDF
+        // plus a hash of the categorisation rules and the parser version,
+        // evicted least-recently-used. Any storage failure is treated as a cache
+        // miss.
+        const RESULT_CACHE_DB = 'bank-statement-results';
+        const RESULT_CACHE_MAX_BYTES = 50 * 1024 * 1024;
+        // Bump when parsing produces different rows for the same PDF, as
+        // CACHE_FORMAT in converter/cache.py; 2: amounts assigned by column
+        const PARSER_VERSION = 2;
+        let rulesVersion = null;
+
+        async function sha256Hex(data) {
+            const digest = await crypto.subtle.digest('SHA-256', data);
+            return Array.from(new Uint8Array(digest)).map(b => b.toString(16).padStart(2, '0')).join('');
+        }
+
+        async function resultCacheKey(arrayBuffer) {
+            try {
+                if (rulesVersion === null) {
+                    rulesVersion = (await sha256Hex(new TextEncoder().encode(rulesJSON()))).slice(0, 16);
+                }
+                return (await sha256Hex(arrayBuffer)) + '-' + rulesVersion + '-p' + PARSER_VERSION;
+            } catch (error) {
+                return null;
+            }
+        }
+
+        function openResultCache() {
+            const request = indexedDB.open(RESULT_CACHE_DB, 1);
+            request.onupgradeneeded = () => {
+                const store = request.result.createObjectStore('results', { keyPath: 'key' });
+                store.createIndex('lastUsed', 'lastUsed');
+            };
+            return idbRequest(request);
+        }
+
+        async function resultCacheGet(key) {
+            if (!key) return null;
+            try {
+                const db = await openResultCache();
+                const store = db.transaction('results', 'readwrite').objectStore('results');
+                const entry = await idbRequest(store.get(key));
+                if (!entry) return null;
+                entry.lastUsed = Date.now();
+                store.put(entry);
+                return entry.rows;
+            } catch (error) {
+                return null;
+            }
+        }
+
+        async function resultCachePut(key, rows) {
+            if (!key) return;
+            try {
+                const db = await openResultCache();
+                const store = db.transaction('results', 'readwrite').objectStore('results');
+                const size = JSON.stringify(rows).length;
+                await idbRequest(store.put({ key, rows, size, lastUsed: Date.now() }));
+
+                // Evict least recently used entries until under the size cap
+                const entries = [];
+                await new Promise((resolve, reject) => {
+                    const cursorRequest = store.index('lastUsed').openCursor();
+                    cursorRequest.onsuccess = () => {
+                        const cursor = cursorRequest.result;
+                        if (!cursor) return resolve();
+                        entries.push({ key: cursor.value.key, size: cursor.value.size });
+                        cursor.continue();
+                    };
+                    cursorRequest.onerror = () => reject(cursorRequest.error);
+                });
+                let total = entries.reduce((sum, entry) => sum + entry.size, 0);
+                for (const entry of entries) {
+                    if (total <= RESULT_CACHE_MAX_BYTES) break;
+                    store.delete(entry.key);
+                    total -= entry.size;
+                }
+            } catch (error) {
+                console.warn('Result cache unavailable:', error);
+            }
+        }
+
+        function displayResults() {
+            timeStage(stageSpans, 'render', renderResults, () => ({ rows: extractedData.length }));
+        }
+
+        function renderResults() {
+            resultSection.style.display = 'block';
+
+            const summary = datasetSummary();
+            const netProfit = summary.netMovement;
+
+            document.getElementById('totalTransactions').textContent = extractedData.length;
+            document.getElementById('totalPaidIn').textContent = '£' + formatPounds(summary.totalIncome);
+            document.getElementById('totalPaidOut').textContent = '£' + formatPounds(summary.totalExpenses);
+            document.getElementById('totalCategories').textContent = summary.categoryCount;
             
-            // Sort categories by amount (descending)
-            const sortedCategories = Object.entries(stats).sort((a, b) => b[1] - a[1]);
+            const netProfitElement = document.getElementById('netProfit');
+            netProfitElement.textContent = '£' + formatPounds(netProfit);
+            netProfitElement.style.color = netProfit >= 0 ? '#4CAF50' : '#f44336';
+
+            // Display category summaries
+            displayCategorySummary(summary.income, 'income', 'incomeCategories');
+            displayCategorySummary(summary.expenses, 'expenses', 'expenseCategories');
+            
+            // Display trial balance
+            displayTrialBalance(summary);
+
+            // Display transaction grid
+            updateGrid();
+        }
+
+        // Category aggregation, built once per dataset and shared by the summary
+        // cards, category lists, trial balance preview and trial balance CSV.
+        // Amounts are integer pence. The summary is frozen, and summaryCache is
+        // cleared whenever categoryStats changes.
+        function datasetSummary() {
+            if (summaryCache === null) summaryCache = summarizeCategoryStats(categoryStats);
+            return summaryCache;
+        }
+
+        function deepFreeze(value) {
+            Object.values(value).forEach(child => {
+                if (child && typeof child === 'object') deepFreeze(child);
+            });
+            return Object.freeze(value);
+        }
+
+        function summarizeCategoryStats(stats) {
+            const income = Object.entries(stats.income);
+            const expenses = Object.entries(stats.expenses);
+            const total = entries => entries.reduce((sum, [, amount]) => sum + amount, 0);
+            const compareNames = new Intl.Collator().compare;
+            const byName = entries => entries.slice().sort((a, b) => compareNames(a[0], b[0]));
+            const byAmount = entries => entries.slice().sort((a, b) => b[1] - a[1]);
+
+            const totalIncome = total(income);
+            const totalExpenses = total(expenses);
+            const netMovement = totalIncome - totalExpenses;
+
+            // Income is credited and expenses debited; the bank account takes the
+            // net movement on whichever side balances them
+            const account = (name, debit, credit) => ({ name, debit, credit });
+            const trialBalance = [
+                { title: 'INCOME', accounts: byName(income).map(([category, amount]) => account(category, null, amount)) },
+                { title: 'EXPENSES', accounts: byName(expenses).map(([category, amount]) => account(category, amount, null)) },
+                { title: 'ASSETS', accounts: [netMovement >= 0
+                    ? account('Bank Account', netMovement, null)
+                    : account('Bank Account', null, -netMovement)] }
+            ];
+
+            return deepFreeze({
+                income: byAmount(income),
+                expenses: byAmount(expenses),
+                categoryCount: income.length + expenses.length,
+                totalIncome,
+                totalExpenses,
+                netMovement,
+                trialBalance,
+                totalDebit: totalExpenses + Math.max(netMovement, 0),
+                totalCredit: totalIncome + Math.max(-netMovement, 0)
+            });
+        }
+
+        // Virtualised transaction grid. A fixed pool of row elements is moved over
+        // the visible window of grid.view, an index into extractedData that
+        // sorting and filtering rebuild without re-rendering the table, so the DOM
+        // stays the same size however many rows there are.
+        const GRID_ROW_HEIGHT = 36;
+        const GRID_OVERSCAN = 6;
+        // Browsers cap element height (about 17.9M px in Firefox), so past this
+        // the spacer stops growing and the scroll fraction picks the top row
+        const GRID_MAX_HEIGHT = 8000000;
+        const GRID_COLUMN_WIDTHS = {
+            'Source file': 'minmax(140px, 1fr)',
+            'Date': '110px',
+            'Transaction type': '170px',
+            'Details': 'minmax(220px, 2fr)',
+            'Category': 'minmax(160px, 1fr)',
+            'Paid in (£)': '100px',
+            'Paid out (£)': '100px',
+            'Balance (£)': '110px'
+        };
+        const GRID_AMOUNT_COLUMNS = new Set(['Paid in (£)', 'Paid out (£)', 'Balance (£)']);
+        const gridCollator = new Intl.Collator('en-GB', { numeric: true, sensitivity: 'base' });
+
+        const grid = {
+            headers: [],
+            data: null,
+            dataLength: 0,
+            view: new Uint32Array(0),
+            index: null,
+            query: { text: '', category: '', type: '', from: '', to: '' },
+            sortColumn: null,
+            sortDirection: 1,
+            rowPool: [],
+            spacerHeight: 0,
+            scrollFrame: null
+        };
+
+        const gridHeader = document.getElementById('gridHeader');
+        const gridViewport = document.getElementById('gridViewport');
+        const gridSpacer = document.getElementById('gridSpacer');
+        const gridCount = document.getElementById('gridCount');
+
+        function updateGrid() {
+            const headers = exportHeaders();
+            if (headers.join('\\u0000') !== grid.headers.join('\\u0000')) {
+                grid.headers = headers;
+                buildGridHeader();
+            }
+            if (grid.data !== extractedData || grid.dataLength !== extractedData.length) {
+                if (grid.data !== extractedData) grid.index = createTransactionIndex();
+                grid.data = extractedData;
+                grid.dataLength = extractedData.length;
+                indexRows(grid.index, extractedData);
+                updateQueryOptions();
+                rebuildGridView();
+            }
+            renderGridWindow();
+        }
+
+        function buildGridHeader() {
+            const template = grid.headers.map(header => GRID_COLUMN_WIDTHS[header] || 'minmax(120px, 1fr)').join(' ');
+            gridHeader.style.gridTemplateColumns = template;
+            gridHeader.innerHTML = '';
+            grid.headers.forEach(header => {
+                const cell = document.createElement('div');
+                cell.textContent = header;
+                if (GRID_AMOUNT_COLUMNS.has(header)) cell.className = 'grid-amount';
+                cell.addEventListener('click', () => sortGrid(header));
+                gridHeader.appendChild(cell);
+            });
+            if (!grid.headers.includes(grid.sortColumn)) grid.sortColumn = null;
+            updateSortIndicator();
+
+            // Row elements are rebuilt for the new column set
+            grid.rowPool.forEach(row => row.remove());
+            grid.rowPool = [];
+            gridSpacer.dataset.template = template;
+        }
+
+        function updateSortIndicator() {
+            Array.from(gridHeader.children).forEach((cell, i) => {
+                const header = grid.headers[i];
+                const arrow = header === grid.sortColumn ? (grid.sortDirection > 0 ? ' ▲' : ' ▼') : '';
+                cell.textContent = header + arrow;
+            });
+        }
+
+        // Amount columns sort on the pence already in the ledger
+        const GRID_AMOUNT_OFFSETS = { 'Paid in (£)': 0, 'Paid out (£)': 1, 'Balance (£)': 2 };
+
+        function gridSortKey(index, column) {
+            if (column in GRID_AMOUNT_OFFSETS) return ledger.amounts[index * AMOUNT_FIELDS + GRID_AMOUNT_OFFSETS[column]];
+            const value = grid.data[index][column] || '';
+            if (column === 'Date') return parseStatementDate(value);
+            return value;
+        }
+
+        // Recompute grid.view from extractedData: answer the query from the
+        // transaction index, then sort the matching indices on keys extracted
+        // once per row
+        function rebuildGridView() {
+            const data = grid.data;
+            let indices;
+            if (Object.values(grid.query).some(value => value)) {
+                indices = queryTransactions(grid.index, grid.query);
+            } else {
+                indices = new Uint32Array(data.length);
+                for (let i = 0; i < data.length; i++) indices[i] = i;
+            }
+
+            if (grid.sortColumn) {
+                const column = grid.sortColumn;
+                const direction = grid.sortDirection;
+                const keys = new Array(data.length);
+                indices.forEach(i => { keys[i] = gridSortKey(i, column); });
+                const compare = (typeof keys[indices[0]] === 'string')
+                    ? (a, b) => gridCollator.compare(keys[a], keys[b])
+                    : (a, b) => keys[a] - keys[b];
+                indices.sort((a, b) => direction * compare(a, b) || a - b);
+            }
+
+            grid.view = indices;
+            grid.spacerHeight = Math.min(indices.length * GRID_ROW_HEIGHT, GRID_MAX_HEIGHT);
+            gridSpacer.style.height = grid.spacerHeight + 'px';
+            if (indices.length === data.length) {
+                gridCount.textContent = `${data.length.toLocaleString('en-GB')} transactions`;
+            } else {
+                // Totals for the matching rows, straight from the pence ledger
+                let paidIn = 0;
+                let paidOut = 0;
+                indices.forEach(i => {
+                    paidIn += ledger.amounts[i * AMOUNT_FIELDS];
+                    paidOut += ledger.amounts[i * AMOUNT_FIELDS + 1];
+                });
+                gridCount.textContent = `${indices.length.toLocaleString('en-GB')} of ${data.length.toLocaleString('en-GB')} transactions`
+                    + ` · £${formatPounds(paidIn)} in · £${formatPounds(paidOut)} out`;
+            }
+        }
+
+        // Fractional view position of the row at the top of the viewport. The
+        // scroll fraction maps onto the rows, which is scrollTop / row height
+        // until the spacer reaches GRID_MAX_HEIGHT.
+        function gridTopRow(scrollTop, viewportHeight) {
+            const range = grid.spacerHeight - viewportHeight;
+            if (range <= 0) return 0;
+            return Math.min(1, scrollTop / range) * (grid.view.length - viewportHeight / GRID_ROW_HEIGHT);
+        }
+
+        function renderGridWindow() {
+            const scrollTop = gridViewport.scrollTop;
+            const viewportHeight = gridViewport.clientHeight || 432;
+            const top = gridTopRow(scrollTop, viewportHeight);
+            const first = Math.max(0, Math.floor(top) - GRID_OVERSCAN);
+            const visible = Math.ceil(viewportHeight / GRID_ROW_HEIGHT) + 2 * GRID_OVERSCAN;
+
+            while (grid.rowPool.length < visible) {
+                const row = document.createElement('div');
+                row.className = 'grid-row';
+                row.style.gridTemplateColumns = gridSpacer.dataset.template;
+                grid.headers.forEach(header => {
+                    const cell = document.createElement('div');
+                    if (GRID_AMOUNT_COLUMNS.has(header)) cell.className = 'grid-amount';
+                    row.appendChild(cell);
+                });
+                gridSpacer.appendChild(row);
+                grid.rowPool.push(row);
+            }
+
+            grid.rowPool.forEach((row, k) => {
+                const position = first + k;
+                if (position >= grid.view.length) {
+                    row.style.display = 'none';
+                    return;
+                }
+                const data = grid.data[grid.view[position]];
+                row.style.display = '';
+                // Placed relative to the viewport, as rows far down may lie past the spacer
+                row.style.transform = `translateY(${scrollTop + (position - top) * GRID_ROW_HEIGHT}px)`;
+                grid.headers.forEach((header, c) => {
+                    const value = data[header] || '';
+                    const cell = row.children[c];
+                    if (cell.textContent !== value) {
+                        cell.textContent = value;
+                        cell.title = value;
+                    }
+                });
+            });
+        }
+
+        function sortGrid(column) {
+            if (grid.sortColumn === column) {
+                grid.sortDirection = -grid.sortDirection;
+            } else {
+                grid.sortColumn = column;
+                grid.sortDirection = 1;
+            }
+            updateSortIndicator();
+            rebuildGridView();
+            renderGridWindow();
+        }
+
+        gridViewport.addEventListener('scroll', () => {
+            if (grid.scrollFrame !== null) return;
+            grid.scrollFrame = requestAnimationFrame(() => {
+                grid.scrollFrame = null;
+                renderGridWindow();
+            });
+        });
+
+        function setGridQuery(field, value) {
+            grid.query[field] = value;
+            if (grid.data) {
+                rebuildGridView();
+                gridViewport.scrollTop = 0;
+                renderGridWindow();
+            }
+        }
+
+        let gridFilterTimer = null;
+        document.getElementById('gridFilter').addEventListener('input', (e) => {
+            clearTimeout(gridFilterTimer);
+            gridFilterTimer = setTimeout(() => setGridQuery('text', e.target.value.trim().toLowerCase()), 150);
+        });
+        [['gridCategory', 'category'], ['gridType', 'type'], ['gridFrom', 'from'], ['gridTo', 'to']].forEach(([id, field]) => {
+            document.getElementById(id).addEventListener('change', (e) => setGridQuery(field, e.target.value));
+        });
+
+        // Offer the categories and transaction types present in the data
+        function updateQueryOptions() {
+            [['gridCategory', grid.index.byCategory], ['gridType', grid.index.byType]].forEach(([id, postings]) => {
+                const select = document.getElementById(id);
+                if (select.options.length === postings.size + 1) return;
+                const current = select.value;
+                const all = select.options[0];
+                select.replaceChildren(all, ...Array.from(postings.keys()).sort().map(value => new Option(value, value)));
+                select.value = postings.has(current) ? current : '';
+            });
+        }
+
+        // Transaction index over extractedData: row positions by category and
+        // transaction type, each row's date as a sortable YYYY-MM-DD key, and a
+        // trigram index over the lowercase Details. Rows are only ever appended,
+        // so every posting list stays in row order.
+        function createTransactionIndex() {
+            return {
+                size: 0,
+                byCategory: new Map(),
+                byType: new Map(),
+                trigrams: new Map(),
+                details: [],
+                dateKeys: [],
+                dateOrder: null
+            };
+        }
+
+        function addPosting(postings, key, position) {
+            const list = postings.get(key);
+            if (list) {
+                list.push(position);
+            } else {
+                postings.set(key, [position]);
+            }
+        }
+
+        function trigramsOf(text) {
+            const grams = new Set();
+            for (let i = 0; i + 3 <= text.length; i++) grams.add(text.slice(i, i + 3));
+            return grams;
+        }
+
+        function indexRows(index, rows) {
+            for (let i = index.size; i < rows.length; i++) {
+                const row = rows[i];
+                const details = (row['Details'] || '').toLowerCase();
+                addPosting(index.byCategory, row['Category'], i);
+                addPosting(index.byType, row['Transaction type'], i);
+                for (const gram of trigramsOf(details)) addPosting(index.trigrams, gram, i);
+                index.details.push(details);
+                index.dateKeys.push(parseStatementDate(row['Date'] || ''));
+            }
+            if (rows.length !== index.size) index.dateOrder = null;
+            index.size = rows.length;
+        }
+
+        function intersectSorted(a, b) {
+            const out = [];
+            let i = 0;
+            let j = 0;
+            while (i < a.length && j < b.length) {
+                if (a[i] < b[j]) {
+                    i++;
+                } else if (a[i] > b[j]) {
+                    j++;
+                } else {
+                    out.push(a[i]);
+                    i++;
+                    j++;
+                }
+            }
+            return out;
+        }
+
+        // Positions with from <= date <= to, by binary search over the rows in
+        // date order, returned in row order
+        function positionsInDateRange(index, from, to) {
+            if (!index.dateOrder) {
+                const keys = index.dateKeys;
+                index.dateOrder = Uint32Array.from({ length: index.size }, (_, i) => i)
+                    .sort((a, b) => (keys[a] < keys[b] ? -1 : keys[a] > keys[b] ? 1 : a - b));
+            }
+            const order = index.dateOrder;
+            const bound = (key, inclusive) => {
+                let lo = 0;
+                let hi = order.length;
+                while (lo < hi) {
+                    const mid = (lo + hi) >> 1;
+                    const value = index.dateKeys[order[mid]];
+                    if (value < key || (inclusive && value === key)) lo = mid + 1; else hi = mid;
+                }
+                return lo;
+            };
+            const start = from ? bound(from, false) : 0;
+            const end = to ? bound(to, true) : order.length;
+            return order.slice(start, Math.max(start, end)).sort();
+        }
+
+        // Rows matching every set field of query, in row order. Category, type and
+        // the text's trigrams narrow the candidates through their posting lists,
+        // smallest first; each candidate is then checked against the full text
+        // and the date range.
+        function queryTransactions(index, query) {
+            const { text, category, type, from, to } = query;
+            const lists = [];
+            if (category) lists.push(index.byCategory.get(category) || []);
+            if (type) lists.push(index.byType.get(type) || []);
+            for (const gram of trigramsOf(text)) lists.push(index.trigrams.get(gram) || []);
+
+            let candidates;
+            if (lists.length > 0) {
+                lists.sort((a, b) => a.length - b.length);
+                candidates = lists.reduce(intersectSorted);
+            } else if (from || to) {
+                return positionsInDateRange(index, from, to);
+            } else {
+                candidates = Array.from({ length: index.size }, (_, i) => i);
+            }
+
+            const matches = candidates.filter(i => {
+                const date = index.dateKeys[i];
+                return (!text || index.details[i].includes(text)) && (!from || date >= from) && (!to || date <= to);
+            });
+            return Uint32Array.from(matches);
+        }
+
+        function displayCategorySummary(sortedCategories, type, elementId) {
+            const container = document.getElementById(elementId);
             
             let html = '';
             sortedCategories.forEach(([category, amount]) => {
-                const formattedAmount = '£' + amount.toLocaleString('en-GB', {minimumFractionDigits: 2, maximumFractionDigits: 2});
+                const formattedAmount = '£' + formatPounds(amount);
                 const colorClass = type === 'income' ? 'income' : 'expense';
                 html += `
                     <div class="category-item">
@@ -823,18 +2306,55 @@ html_content = """
             container.innerHTML = html;
         }
 
-        function parseStatementDate(dateStr) {
-            // Parse "1 Jan 2024" format to "2024-01-01"
-            const months = {
-                'Jan': '01', 'Feb': '02', 'Mar': '03', 'Apr': '04',
-                'May': '05', 'Jun': '06', 'Jul': '07', 'Aug': '08',
-                'Sep': '09', 'Oct': '10', 'Nov': '11', 'Dec': '12'
+        // strptime-style formats with %d, %m, %b, %Y and %y; spaces match any run
+        // of spaces and two-digit years pivot at 69, as in Python
+        const DATE_FORMAT_FIELDS = {
+            '%d': ['day', '([0-9]{1,2})'],
+            '%m': ['month', '([0-9]{1,2})'],
+            '%b': ['monthName', '([A-Za-z]{3})'],
+            '%Y': ['year', '([0-9]{4})'],
+            '%y': ['shortYear', '([0-9]{2})']
+        };
+        const MONTH_NUMBERS = {
+            jan: '01', feb: '02', mar: '03', apr: '04', may: '05', jun: '06',
+            jul: '07', aug: '08', sep: '09', oct: '10', nov: '11', dec: '12'
+        };
+
+        function compileDateFormat(format) {
+            const fields = [];
+            // Other characters are literal; regex metacharacters go in a class
+            const source = format.replace(/%[dmbYy]|[.*+?${}()|[]| /g, token => {
+                if (token === ' ') return ' +';
+                const field = DATE_FORMAT_FIELDS[token];
+                if (!field) return `[${token}]`;
+                fields.push(field[0]);
+                return field[1];
+            });
+            const re = new RegExp('^' + source + '$');
+            return function parse(dateStr) {
+                const match = re.exec(dateStr.trim());
+                if (!match) return null;
+                const parts = {};
+                fields.forEach((field, i) => { parts[field] = match[i + 1]; });
+                const month = parts.monthName ? MONTH_NUMBERS[parts.monthName.toLowerCase()] : parts.month;
+                let year = parts.year;
+                if (parts.shortYear) year = (Number(parts.shortYear) < 69 ? '20' : '19') + parts.shortYear;
+                if (!month || !year || !parts.day) return null;
+                return `${year}-${month.padStart(2, '0')}-${parts.day.padStart(2, '0')}`;
             };
-            const parts = dateStr.trim().split(/\\s+/);
-            const day = parts[0].padStart(2, '0');
-            const month = months[parts[1]];
-            const year = parts[2];
-            return `${year}-${month}-${day}`;
+        }
+
+        // Statement dates as "YYYY-MM-DD" keys for sorting and filtering, read
+        // with each profile's dateFormat in turn so statements from several
+        // banks can be merged; '' when none matches
+        const statementDateParsers = [...new Set(BANK_PROFILES.map(profile => profile.dateFormat))].map(compileDateFormat);
+
+        function parseStatementDate(dateStr) {
+            for (const parse of statementDateParsers) {
+                const key = parse(dateStr);
+                if (key !== null) return key;
+            }
+            return '';
         }
 
         function switchTab(tab) {
@@ -856,72 +2376,32 @@ html_content = """
             }
         }
 
-        function displayTrialBalance() {
+        const TRIAL_BALANCE_SECTION_COLOURS = { INCOME: '#f0f8ff', EXPENSES: '#fff3e0', ASSETS: '#e8f5e9' };
+
+        function displayTrialBalance(summary) {
             const container = document.getElementById('trialBalancePreview');
+            const amountCell = pence => pence === null ? '<td>-</td>' : `<td style="text-align: right;">${formatPounds(pence)}</td>`;
             
             let html = '<div style="overflow-x: auto;"><table style="width: 100%; margin-top: 10px;">';
             html += '<thead><tr><th>Account</th><th>Debit (£)</th><th>Credit (£)</th></tr></thead><tbody>';
             
-            let totalDebit = 0;
-            let totalCredit = 0;
-            
-            // Income categories (Credits) - Money received
-            html += '<tr style="background: #f0f8ff;"><td colspan="3"><strong>INCOME</strong></td></tr>';
-            const sortedIncome = Object.entries(categoryStats.income).sort((a, b) => a[0].localeCompare(b[0]));
-            sortedIncome.forEach(([category, amount]) => {
-                totalCredit += amount;
-                html += `<tr>
-                    <td>${category}</td>
-                    <td>-</td>
-                    <td style="text-align: right;">${amount.toLocaleString('en-GB', {minimumFractionDigits: 2, maximumFractionDigits: 2})}</td>
-                </tr>`;
-            });
-            
-            html += '<tr style="height: 10px;"><td colspan="3"></td></tr>';
-            
-            // Expense categories (Debits) - Money paid out
-            html += '<tr style="background: #fff3e0;"><td colspan="3"><strong>EXPENSES</strong></td></tr>';
-            const sortedExpenses = Object.entries(categoryStats.expenses).sort((a, b) => a[0].localeCompare(b[0]));
-            sortedExpenses.forEach(([category, amount]) => {
-                totalDebit += amount;
-                html += `<tr>
-                    <td>${category}</td>
-                    <td style="text-align: right;">${amount.toLocaleString('en-GB', {minimumFractionDigits: 2, maximumFractionDigits: 2})}</td>
-                    <td>-</td>
+            summary.trialBalance.forEach(section => {
+                html += `<tr style="background: ${TRIAL_BALANCE_SECTION_COLOURS[section.title]};"><td colspan="3"><strong>${section.title}</strong></td></tr>`;
+                section.accounts.forEach(account => {
+                    html += `<tr>
+                    <td>${account.name}</td>
+                    ${amountCell(account.debit)}
+                    ${amountCell(account.credit)}
                 </tr>`;
+                });
+                html += '<tr style="height: 10px;"><td colspan="3"></td></tr>';
             });
             
-            html += '<tr style="height: 10px;"><td colspan="3"></td></tr>';
-            
-            // Calculate net movement (income - expenses)
-            const netMovement = totalCredit - totalDebit;
-            
-            // Bank Account - shows the net effect
-            html += '<tr style="background: #e8f5e9;"><td colspan="3"><strong>ASSETS</strong></td></tr>';
-            if (netMovement >= 0) {
-                // Net income - Bank account increases (Debit)
-                totalDebit += netMovement;
-                html += `<tr>
-                    <td>Bank Account</td>
-                    <td style="text-align: right;">${netMovement.toLocaleString('en-GB', {minimumFractionDigits: 2, maximumFractionDigits: 2})}</td>
-                    <td>-</td>
-                </tr>`;
-            } else {
-                // Net loss - Bank account decreases (Credit)
-                totalCredit += Math.abs(netMovement);
-                html += `<tr>
-                    <td>Bank Account</td>
-                    <td>-</td>
-                    <td style="text-align: right;">${Math.abs(netMovement).toLocaleString('en-GB', {minimumFractionDigits: 2, maximumFractionDigits: 2})}</td>
-                </tr>`;
-            }
-            
             // Totals
-            html += '<tr style="height: 10px;"><td colspan="3"></td></tr>';
             html += `<tr style="border-top: 2px solid #667eea; background: #f0f8ff;">
                 <td><strong>TOTAL</strong></td>
-                <td style="text-align: right;"><strong>${totalDebit.toLocaleString('en-GB', {minimumFractionDigits: 2, maximumFractionDigits: 2})}</strong></td>
-                <td style="text-align: right;"><strong>${totalCredit.toLocaleString('en-GB', {minimumFractionDigits: 2, maximumFractionDigits: 2})}</strong></td>
+                <td style="text-align: right;"><strong>${formatPounds(summary.totalDebit)}</strong></td>
+                <td style="text-align: right;"><strong>${formatPounds(summary.totalCredit)}</strong></td>
             </tr>`;
             
             html += '</tbody></table></div>';
@@ -931,15 +2411,15 @@ html_content = """
                 ℹ️ <strong>Note:</strong> This Trial Balance represents the movement in cash during the period based on transactions in the bank statement. It does not include opening balances.
             </p>`;
             
-            // Check if balanced
-            const difference = Math.abs(totalDebit - totalCredit);
-            if (difference < 0.01) {
+            // Check if balanced; pence totals are exact, so no tolerance is needed
+            const difference = Math.abs(summary.totalDebit - summary.totalCredit);
+            if (difference === 0) {
                 html += `<p style="margin-top: 15px; padding: 10px; background: #e8f5e9; border-left: 4px solid #4CAF50; font-size: 12px; color: #2e7d32;">
                     ✅ <strong>Trial Balance is balanced!</strong> Debits equal Credits.
                 </p>`;
             } else {
                 html += `<p style="margin-top: 15px; padding: 10px; background: #ffebee; border-left: 4px solid #f44336; font-size: 12px; color: #c62828;">
-                    ⚠️ <strong>Warning:</strong> Trial Balance difference of £${difference.toFixed(2)}
+                    ⚠️ <strong>Warning:</strong> Trial Balance difference of £${formatPounds(difference)}
                 </p>`;
             }
             
@@ -947,140 +2427,64 @@ html_content = """
         }
 
         document.getElementById('downloadBtn').addEventListener('click', () => {
-            const csvContent = convertToCSV(extractedData);
+            const csvParts = convertToCSV(extractedData);
             const now = new Date();
             const filename = `bank_statement_categorized_${now.getFullYear()}_${(now.getMonth()+1).toString().padStart(2,'0')}_${now.getDate().toString().padStart(2,'0')}.csv`;
-            downloadCSV(csvContent, filename);
+            downloadCSV(csvParts, filename);
         });
 
         document.getElementById('downloadTrialBalanceBtn').addEventListener('click', () => {
-            const trialBalanceData = [];
-            
+            const summary = datasetSummary();
+            const line = (account, debit = '', credit = '') => ({ 'Account': account, 'Debit (£)': debit, 'Credit (£)': credit });
+            const amount = pence => pence === null ? '' : penceToDecimal(pence);
+
             // Add header
-            trialBalanceData.push({
-                'Account': 'TRIAL BALANCE',
-                'Debit (£)': '',
-                'Credit (£)': ''
-            });
-            trialBalanceData.push({
-                'Account': 'Period transactions only (excluding opening balances)',
-                'Debit (£)': '',
-                'Credit (£)': ''
-            });
-            trialBalanceData.push({
-                'Account': '',
-                'Debit (£)': '',
-                'Credit (£)': ''
-            });
+            const trialBalanceData = [
+                line('TRIAL BALANCE'),
+                line('Period transactions only (excluding opening balances)'),
+                line('')
+            ];
             
-            let totalDebit = 0;
-            let totalCredit = 0;
-            
-            // Income (Credits)
-            trialBalanceData.push({
-                'Account': 'INCOME',
-                'Debit (£)': '',
-                'Credit (£)': ''
-            });
-            
-            const sortedIncome = Object.entries(categoryStats.income).sort((a, b) => a[0].localeCompare(b[0]));
-            sortedIncome.forEach(([category, amount]) => {
-                totalCredit += amount;
-                trialBalanceData.push({
-                    'Account': category,
-                    'Debit (£)': '',
-                    'Credit (£)': amount.toFixed(2)
+            summary.trialBalance.forEach(section => {
+                trialBalanceData.push(line(section.title));
+                section.accounts.forEach(account => {
+                    trialBalanceData.push(line(account.name, amount(account.debit), amount(account.credit)));
                 });
+                trialBalanceData.push(line(''));
             });
             
-            trialBalanceData.push({
-                'Account': '',
-                'Debit (£)': '',
-                'Credit (£)': ''
-            });
-            
-            // Expenses (Debits)
-            trialBalanceData.push({
-                'Account': 'EXPENSES',
-                'Debit (£)': '',
-                'Credit (£)': ''
-            });
-            
-            const sortedExpenses = Object.entries(categoryStats.expenses).sort((a, b) => a[0].localeCompare(b[0]));
-            sortedExpenses.forEach(([category, amount]) => {
-                totalDebit += amount;
-                trialBalanceData.push({
-                    'Account': category,
-                    'Debit (£)': amount.toFixed(2),
-                    'Credit (£)': ''
-                });
-            });
-            
-            trialBalanceData.push({
-                'Account': '',
-                'Debit (£)': '',
-                'Credit (£)': ''
-            });
-            
-            // Bank Account - net movement
-            trialBalanceData.push({
-                'Account': 'ASSETS',
-                'Debit (£)': '',
-                'Credit (£)': ''
-            });
-            
-            const netMovement = totalCredit - totalDebit;
-            if (netMovement >= 0) {
-                // Net income - Bank increases (Debit)
-                totalDebit += netMovement;
-                trialBalanceData.push({
-                    'Account': 'Bank Account',
-                    'Debit (£)': netMovement.toFixed(2),
-                    'Credit (£)': ''
-                });
-            } else {
-                // Net loss - Bank decreases (Credit)
-                totalCredit += Math.abs(netMovement);
-                trialBalanceData.push({
-                    'Account': 'Bank Account',
-                    'Debit (£)': '',
-                    'Credit (£)': Math.abs(netMovement).toFixed(2)
-                });
-            }
-            
             // Totals
-            trialBalanceData.push({
-                'Account': '',
-                'Debit (£)': '',
-                'Credit (£)': ''
-            });
-            trialBalanceData.push({
-                'Account': 'TOTAL',
-                'Debit (£)': totalDebit.toFixed(2),
-                'Credit (£)': totalCredit.toFixed(2)
-            });
+            trialBalanceData.push(line('TOTAL', penceToDecimal(summary.totalDebit), penceToDecimal(summary.totalCredit)));
             
             // Convert to CSV
-            let csv = 'Account,Debit (£),Credit (£)\\n';
-            trialBalanceData.forEach(row => {
-                const values = [row['Account'], row['Debit (£)'], row['Credit (£)']].map(value => {
-                    if (typeof value === 'string' && (value.includes(',') || value.includes('"') || value.includes('\\n'))) {
-                        return '"' + value.replace(/"/g, '""') + '"';
-                    }
-                    return value;
-                });
-                csv += values.join(',') + '\\n';
-            });
+            const csvParts = convertToCSV(trialBalanceData, ['Account', 'Debit (£)', 'Credit (£)']);
             
             const now = new Date();
             const filename = `trial_balance_${now.getFullYear()}_${(now.getMonth()+1).toString().padStart(2,'0')}_${now.getDate().toString().padStart(2,'0')}.csv`;
-            downloadCSV(csv, filename);
+            downloadCSV(csvParts, filename);
         });
 
-        function updateProgress(percent, message) {
-            progressBar.style.width = percent + '%';
-            progressBar.textContent = Math.round(percent) + '%';
-            statusMessage.textContent = message;
+        // Add a progress bar for one file and return its update function
+        function createFileProgress(fileName) {
+            const entry = document.createElement('div');
+            entry.className = 'file-progress';
+            entry.innerHTML = `
+                <div class="file-name"></div>
+                <div class="progress-bar-container">
+                    <div class="progress-bar">0%</div>
+                </div>
+                <div class="status-message">Waiting...</div>
+            `;
+            entry.querySelector('.file-name').textContent = fileName;
+            fileProgressList.appendChild(entry);
+
+            const progressBar = entry.querySelector('.progress-bar');
+            const statusMessage = entry.querySelector('.status-message');
+            return function updateProgress(percent, message) {
+                progressBar.style.width = percent + '%';
+                progressBar.textContent = Math.round(percent) + '%';
+                statusMessage.textContent = message;
+            };
         }
 
         function showError(message) {
@@ -1097,4 +2501,4 @@ html_content = """
 """
 
 # Display the HTML component
-components.html(html_content, height=1200, scrolling=True)
+components.html(html_content.replace("__PDFJS_BASE__", PDFJS_BASE), height=1200, scrolling=True)
@@ -0,0 +1,55 @@
+import os
+
+from converter import cache as cache_module
+from converter.cache import ResultCache
+
+ROWS = [{'Date': '2 Jan 2024', 'Details': 'Café', 'Category': 'Other Income'}]
+
+
+def test_round_trip(tmp_path):
+    cache = ResultCache(tmp_path)
+    key = ResultCache.key(b'%PDF-1.4 statement')
+    assert cache.get(key) is None
+    cache.put(key, ROWS)
+    assert cache.get(key) == ROWS
+
+
+def test_key_depends_on_pdf_profile_rules_and_format(monkeypatch):
+    key = ResultCache.key(b'a')
+    assert key == ResultCache.key(b'a')
+    assert key != ResultCache.key(b'b')
+    assert key != ResultCache.key(b'a', 'tide')
+    monkeypatch.setattr(cache_module, 'rules_version', lambda: 'other')
+    assert key != ResultCache.key(b'a')
+    monkeypatch.undo()
+    monkeypatch.setattr(cache_module, 'CACHE_FORMAT', cache_module.CACHE_FORMAT + 1)
+    assert key != ResultCache.key(b'a')
+
+
+def test_corrupt_entry_is_a_miss(tmp_path):
+    cache = ResultCache(tmp_path)
+    (tmp_path / 'key.json').write_text('{"truncated', encoding='utf-8')
+    assert cache.get('key') is None
+
+
+def test_get_keeps_rows_when_entry_is_evicted_after_the_read(tmp_path, monkeypatch):
+    cache = ResultCache(tmp_path)
+    cache.put('key', ROWS)
+
+    def evicted(path, *args, **kwargs):
+        raise FileNotFoundError(path)
+
+    monkeypatch.setattr(os, 'utime', evicted)
+    assert cache.get('key') == ROWS
+
+
+def test_put_evicts_least_recently_used(tmp_path):
+    cache = ResultCache(tmp_path)
+    for i, key in enumerate(['a', 'b', 'c']):
+        cache.put(key, ROWS)
+        os.utime(tmp_path / f'{key}.json', (i, i))
+    # Reading 'a' makes it the most recently used
+    cache.get('a')
+    cache.max_bytes = 2 * (tmp_path / 'a.json').stat().st_size
+    cache.put('d', ROWS)
+    assert sorted(p.stem for p in tmp_path.glob('*.json')) == ['a', 'd']
@@ -0,0 +1,77 @@
+import pandas as pd
+import pytest
+
+from converter import categories
+from converter.categories import categorize_transaction, merchant_key
+from converter.vectorized import categorize_frame
+
+ROWS = [
+    # details, transaction type, paid in, paid out, category
+    ('SUMUP PAYMENTS 12345678', 'Domestic Transfer', '120.00', '', 'Card Payments'),
+    ('J Smith', 'Domestic Transfer', '50.00', '', 'Bank Transfers'),
+    ('Refund Amazon', 'Card Transaction Refund', '9.99', '', 'Refunds'),
+    ('Cash deposit', 'Deposit', '10.00', '', 'Other Income'),
+    ('Tide Card **** 1234 O2 UK', 'Card Transaction', '', '30.00', 'Utilities & Communications'),
+    ('Uber 01/02/2024', 'Card Transaction', '', '12.50', 'Travel & Transport'),
+    ('HMRC VAT REF 123456789', 'Domestic Transfer', '', '800.00', 'Professional Services'),
+    ('Monthly account fee', 'Fee', '', '5.00', 'Bank Fees & Charges'),
+    ('Unknown Ltd', 'Direct Debit', '', '20.00', 'Utilities & Communications'),
+    ('Unknown Ltd', 'Card Transaction', '', '20.00', 'General Business Expenses'),
+    # References and masks never match a keyword: '2' is not 'o2'
+    ('Ref 02 **** XX2', 'Card Transaction', '', '1.00', 'General Business Expenses'),
+]
+
+
+@pytest.mark.parametrize('details, trans_type, paid_in, paid_out, category', ROWS)
+def test_categorize_transaction(details, trans_type, paid_in, paid_out, category):
+    assert categorize_transaction(details, trans_type, paid_in, paid_out) == category
+
+
+def test_merchant_key_drops_references_and_masks():
+    assert merchant_key('Tide Card **** 1234 O2 UK') == 'tide card # # o2 uk'
+    assert merchant_key('Uber 01/02/2024') == 'uber #'
+
+
+def test_categorize_frame_matches_categorize_transaction():
+    df = pd.DataFrame(ROWS * 3, columns=['Details', 'Transaction type', 'Paid in (£)', 'Paid out (£)', 'Expected'])
+    df.index = df.index * 2
+    categories = categorize_frame(df)
+    assert categories.index.equals(df.index)
+    assert categories.tolist() == [
+        categorize_transaction(*row) for row in df[['Details', 'Transaction type', 'Paid in (£)', 'Paid out (£)']].itertuples(index=False)
+    ]
+    assert categories.tolist() == df['Expected'].tolist()
+
+
+@pytest.mark.parametrize('table, key, value', [
+    ('CATEGORIES', 'income', {'Other Income': []}),
+    ('INCOME_TYPE_DEFAULTS', 'Deposit', 'Other Income'),
+    ('EXPENSE_TYPE_DEFAULTS', 'Direct Debit', 'General Business Expenses'),
+])
+def test_rules_version_covers_every_table(monkeypatch, table, key, value):
+    before = categories.rules_version()
+    monkeypatch.setitem(getattr(categories, table), key, value)
+    assert categories.rules_version() != before
+
+
+def test_rules_version_covers_default_categories(monkeypatch):
+    before = categories.rules_version()
+    monkeypatch.setattr(categories, 'DEFAULT_EXPENSE', 'Sundries')
+    assert categories.rules_version() != before
+
+
+@pytest.mark.parametrize('keyword', ['24/7', 'open 24/7', '24x7 support', 'ref #', 'x'])
+def test_compile_rules_rejects_keywords_merchant_keys_hide(monkeypatch, keyword):
+    monkeypatch.setitem(categories.CATEGORIES['expenses'], 'Custom', [keyword])
+    with pytest.raises(ValueError, match='never match'):
+        categories.compile_rules()
+    monkeypatch.undo()
+    categories.compile_rules()
+
+
+def test_compile_rules_accepts_words_with_letters(monkeypatch):
+    monkeypatch.setitem(categories.CATEGORIES['expenses'], 'Custom', ['acme 4g'])
+    categories.compile_rules()
+    assert categorize_transaction('ACME 4G 0412', 'Card Transaction', '', '1.00') == 'Custom'
+    monkeypatch.undo()
+    categories.compile_rules()
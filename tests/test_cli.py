@@ -0,0 +1,72 @@
+from pathlib import Path
+
+import pandas as pd
+
+from benchmarks.statement_pdf import make_statement
+from converter.cli import SOURCE_COLUMN, find_pdfs, output_names, run, source_names
+
+
+def touch(path: Path, data: bytes = b'') -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return path
+
+
+def test_find_pdfs_searches_directories_recursively(tmp_path):
+    top = touch(tmp_path / 'statements' / 'march.pdf')
+    nested = touch(tmp_path / 'statements' / 'client-a' / '2024' / 'April.PDF')
+    touch(tmp_path / 'statements' / 'client-a' / 'notes.txt')
+    assert find_pdfs([str(tmp_path / 'statements')]) == sorted([top, nested])
+
+
+def test_find_pdfs_globs_and_deduplicates(tmp_path):
+    a = touch(tmp_path / 'a.pdf')
+    b = touch(tmp_path / 'sub' / 'b.pdf')
+    found = find_pdfs([str(tmp_path / '**' / '*.pdf'), str(a), str(tmp_path)])
+    assert found == sorted([a, b])
+
+
+def test_source_names_are_paths_below_the_common_folder(tmp_path):
+    a = tmp_path / 'client-a' / 'march.pdf'
+    b = tmp_path / 'client-b' / 'march.pdf'
+    c = tmp_path / 'client-b' / 'nested' / 'april.pdf'
+    assert source_names([a, b, c]) == {
+        a: 'client-a/march.pdf',
+        b: 'client-b/march.pdf',
+        c: 'client-b/nested/april.pdf',
+    }
+    assert source_names([a]) == {a: 'march.pdf'}
+
+
+def test_output_names_suffix_collisions_and_reserved_names():
+    a, b, c, d = (Path(name) for name in 'abcd')
+    names = {a: 'March.pdf', b: 'march.PDF', c: 'combined.pdf', d: 'sub/march.pdf'}
+    assert output_names(names, reserved=('combined',)) == {
+        a: 'March',
+        b: 'march-2',
+        c: 'combined-2',
+        d: 'sub/march',
+    }
+
+
+def test_run_writes_per_folder_outputs_and_combined(tmp_path):
+    inputs = tmp_path / 'statements'
+    touch(inputs / 'client-a' / 'march.pdf', make_statement(1, 5, seed=1))
+    touch(inputs / 'client-b' / 'march.pdf', make_statement(1, 7, seed=2))
+    out = tmp_path / 'out'
+
+    assert run(find_pdfs([str(inputs)]), out, workers=2) == 0
+    assert len(pd.read_csv(out / 'client-a' / 'march.csv')) == 5
+    assert len(pd.read_csv(out / 'client-b' / 'march.csv')) == 7
+    combined = pd.read_csv(out / 'combined.csv')
+    assert combined[SOURCE_COLUMN].value_counts().to_dict() == {'client-a/march.pdf': 5, 'client-b/march.pdf': 7}
+
+
+def test_run_single_file_writes_no_combined(tmp_path):
+    pdf = touch(tmp_path / 'combined.pdf', make_statement(1, 5))
+    out = tmp_path / 'out'
+    assert run([pdf], out) == 0
+    assert sorted(p.name for p in out.iterdir()) == ['combined.csv']
+    # The statement's own file, not a combined one with a Source file column
+    written = pd.read_csv(out / 'combined.csv')
+    assert len(written) == 5 and SOURCE_COLUMN not in written
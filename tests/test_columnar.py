@@ -0,0 +1,61 @@
+from datetime import date
+from decimal import Decimal
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from converter import profiles
+from converter.columnar import to_arrow_table, write_arrow, write_parquet
+from converter.extraction import CSV_COLUMNS
+from converter.profiles import BankProfile, parse_dates
+
+COLUMNS = ['Source file'] + CSV_COLUMNS
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame([
+        ['a.pdf', '2 Jan 2024', 'Domestic Transfer', 'SUMUP PAYMENTS', 'Card Payments', '1234.56', '', '1234.56'],
+        ['a.pdf', '3 Feb 2024', 'Direct Debit', 'BT Group', 'Utilities & Communications', '', '30.00', '1204.56'],
+        ['b.pdf', '', 'Fee', 'Monthly fee', 'Bank Fees & Charges', '', '5.00', ''],
+    ], columns=COLUMNS)
+
+
+def test_to_arrow_table_types(df):
+    table = to_arrow_table(df, COLUMNS)
+    assert table.schema.field('Date').type == pa.date32()
+    assert table.schema.field('Paid in (£)').type == pa.decimal128(12, 2)
+    assert pa.types.is_dictionary(table.schema.field('Category').type)
+    assert pa.types.is_dictionary(table.schema.field('Source file').type)
+    assert table.schema.field('Details').type == pa.string()
+
+    assert table.column('Date').to_pylist() == [date(2024, 1, 2), date(2024, 2, 3), None]
+    assert table.column('Paid in (£)').to_pylist() == [Decimal('1234.56'), None, None]
+    assert table.column('Balance (£)').to_pylist() == [Decimal('1234.56'), Decimal('1204.56'), None]
+
+
+@pytest.mark.parametrize('write, read', [
+    (write_parquet, pq.read_table),
+    (write_arrow, lambda path: pa.ipc.open_file(str(path)).read_all()),
+])
+def test_round_trip(tmp_path, df, write, read):
+    path = tmp_path / 'out'
+    write(df, path, COLUMNS)
+    assert read(path).equals(to_arrow_table(df, COLUMNS))
+
+
+def test_parse_dates_uses_every_profile_format(monkeypatch):
+    monkeypatch.setitem(profiles.PROFILES, 'iso', BankProfile(
+        name='iso', markers=['iso bank'], date_pattern=r'^(\d{4}-\d{2}-\d{2})',
+        transaction_types=['Fee'], date_format='%Y-%m-%d',
+    ))
+    dates = parse_dates(pd.Series(['2 Jan 2024', '2024-03-04', '']))
+    assert dates.dt.date.tolist()[:2] == [date(2024, 1, 2), date(2024, 3, 4)]
+    assert pd.isna(dates.iloc[2])
+
+
+def test_parse_dates_rejects_unknown_format():
+    with pytest.raises(ValueError, match='01/02/2024'):
+        parse_dates(pd.Series(['2 Jan 2024', '01/02/2024']))
@@ -0,0 +1,34 @@
+import pandas as pd
+
+from converter.export import convert_to_csv, iter_csv
+
+
+def test_escaping():
+    df = pd.DataFrame({
+        'Details': ['plain', 'a, b', 'say "hi"', 'two\nlines', None],
+        'Paid in (£)': ['1.00', '', float('nan'), '2.00', '3.00'],
+    })
+    assert convert_to_csv(df) == (
+        'Details,Paid in (£)\n'
+        'plain,1.00\n'
+        '"a, b",\n'
+        '"say ""hi""",\n'
+        '"two\nlines",2.00\n'
+        ',3.00\n'
+    )
+
+
+def test_columns_select_and_order():
+    df = pd.DataFrame({'a': ['1'], 'b': ['2'], 'c': ['3']})
+    assert convert_to_csv(df, ['c', 'a']) == 'c,a\n3,1\n'
+
+
+def test_iter_csv_chunks():
+    df = pd.DataFrame({'n': [str(i) for i in range(5)]})
+    chunks = list(iter_csv(df, chunk_rows=2))
+    assert chunks == ['n\n', '0\n1\n', '2\n3\n', '4\n']
+    assert ''.join(chunks) == convert_to_csv(df)
+
+
+def test_empty_frame_is_header_only():
+    assert list(iter_csv(pd.DataFrame(columns=['a', 'b']))) == ['a,b\n']
@@ -0,0 +1,96 @@
+import pytest
+
+from benchmarks.statement_pdf import make_statement
+from converter import CSV_COLUMNS, extract_transactions
+from converter.categories import categorize_transaction
+from converter.extraction import extract_table_data, group_into_lines
+from converter.profiles import TIDE
+
+
+def item(x, y, text):
+    return {'text': text, 'x': x, 'y': y, 'height': 8}
+
+
+def line(y, *cells):
+    return [item(x, y, text) for x, text in cells]
+
+
+HEADER = line(760, (40, 'Date'), (100, 'Transaction type'), (200, 'Details'),
+              (380, 'Paid in'), (440, 'Paid out'), (510, 'Balance'))
+
+
+def test_group_into_lines_orders_top_down_and_by_x():
+    items = [
+        item(200, 700, 'Broadband'),
+        item(40, 744, '2 Jan 2024'),
+        item(40, 702, '3 Jan 2024'),
+        item(100, 744, 'Direct Debit'),
+        item(300, 745, ''),
+        item(100, 700, 'Fee'),
+    ]
+    lines = group_into_lines(items)
+    assert [[i['text'] for i in ln] for ln in lines] == [
+        ['2 Jan 2024', 'Direct Debit'],
+        ['3 Jan 2024', 'Fee', 'Broadband'],
+    ]
+
+
+def test_group_into_lines_splits_on_gap_above_threshold():
+    lines = group_into_lines([item(40, 700, 'a'), item(40, 694, 'b'), item(40, 689, 'c')])
+    assert [[i['text'] for i in ln] for ln in lines] == [['a'], ['b', 'c']]
+
+
+def test_extract_table_data_count_based():
+    lines = [
+        line(744, (40, '2 Jan 2024'), (100, 'Direct Debit'), (200, 'BT Group'), (440, '1,234.56'), (510, '8,765.44')),
+        line(728, (40, '3 Jan 2024'), (100, 'Domestic Transfer'), (200, 'SUMUP PAYMENTS'), (380, '10.00'), (510, '8,775.44')),
+        line(712, (40, '4 Jan 2024'), (100, 'Card Transaction'), (200, 'Tide Card'), (245, '****'),
+             (290, 'Uber'), (440, '5.00'), (510, '8,770.44')),
+        line(696, (40, 'Opening balance'), (510, '9,000.00')),
+    ]
+    rows = extract_table_data(lines)
+    assert rows == [
+        {'Date': '2 Jan 2024', 'Transaction type': 'Direct Debit', 'Details': 'BT Group',
+         'Paid in (£)': '', 'Paid out (£)': '1234.56', 'Balance (£)': '8765.44'},
+        {'Date': '3 Jan 2024', 'Transaction type': 'Domestic Transfer', 'Details': 'SUMUP PAYMENTS',
+         'Paid in (£)': '10.00', 'Paid out (£)': '', 'Balance (£)': '8775.44'},
+        {'Date': '4 Jan 2024', 'Transaction type': 'Card Transaction', 'Details': 'Uber',
+         'Paid in (£)': '', 'Paid out (£)': '5.00', 'Balance (£)': '8770.44'},
+    ]
+
+
+def test_extract_table_data_learned_columns():
+    profile = TIDE.with_header_columns([HEADER])
+    lines = [
+        # One amount under Paid in, with no income keyword in the details
+        line(744, (40, '2 Jan 2024'), (100, 'Domestic Transfer'), (200, 'J Smith'), (380, '50.00'), (510, '150.00')),
+        # Balance outside the learned columns falls back to the amount count
+        line(728, (40, '3 Jan 2024'), (100, 'Fee'), (200, 'Monthly fee'), (300, '1.00'), (340, '149.00')),
+    ]
+    rows = extract_table_data(lines, profile)
+    assert [(r['Paid in (£)'], r['Paid out (£)'], r['Balance (£)']) for r in rows] == [
+        ('50.00', '', '150.00'),
+        ('', '1.00', '149.00'),
+    ]
+
+
+@pytest.fixture(scope='module')
+def statement():
+    return extract_transactions(make_statement(pages=3, rows_per_page=20, seed=1))
+
+
+def test_extract_transactions_end_to_end(statement):
+    assert list(statement.columns) == CSV_COLUMNS
+    assert len(statement) == 60
+
+    # Running balance agrees with every row's amount
+    pence = {c: statement[c].replace('', '0').astype(float).mul(100).round().astype(int)
+             for c in ('Paid in (£)', 'Paid out (£)', 'Balance (£)')}
+    movement = (pence['Paid in (£)'] - pence['Paid out (£)']).iloc[1:].reset_index(drop=True)
+    step = pence['Balance (£)'].diff().iloc[1:].reset_index(drop=True).astype(int)
+    assert movement.equals(step)
+
+    assert statement['Category'].tolist() == [
+        categorize_transaction(r['Details'], r['Transaction type'], r['Paid in (£)'], r['Paid out (£)'])
+        for r in statement.to_dict('records')
+    ]
@@ -0,0 +1,61 @@
+from types import SimpleNamespace
+
+from pdfminer.pdftypes import PDFStream
+
+from converter.page_store import PageStore, page_fingerprint
+from converter.profiles import TIDE
+
+CONTENT = b'BT /F1 8 Tf 40 744 Td <0102> Tj ET'
+
+
+def page(font_program: bytes, content: bytes = CONTENT):
+    # An Identity-H font without ToUnicode: pdfminer takes the text from the
+    # embedded TrueType program
+    font = {
+        'Type': 'Font', 'Subtype': 'Type0', 'BaseFont': 'ABCDEF+Arial', 'Encoding': 'Identity-H',
+        'DescendantFonts': [{
+            'Type': 'Font', 'Subtype': 'CIDFontType2', 'BaseFont': 'ABCDEF+Arial',
+            'FontDescriptor': {'Type': 'FontDescriptor', 'FontFile2': PDFStream({}, font_program)},
+        }],
+    }
+    return SimpleNamespace(page_obj=SimpleNamespace(
+        contents=[PDFStream({}, content)],
+        resources={'Font': {'F1': font}},
+        mediabox=[0, 0, 595, 842],
+        cropbox=[0, 0, 595, 842],
+        rotate=0,
+    ))
+
+
+def test_fingerprint_is_stable():
+    assert page_fingerprint(page(b'glyphs A')) == page_fingerprint(page(b'glyphs A'))
+
+
+def test_fingerprint_differs_by_content():
+    assert page_fingerprint(page(b'glyphs A')) != page_fingerprint(page(b'glyphs A', CONTENT.replace(b'744', b'728')))
+
+
+def test_fingerprint_differs_by_embedded_font():
+    # Same content stream and font dictionaries, different subset programs
+    assert page_fingerprint(page(b'glyphs A')) != page_fingerprint(page(b'glyphs B'))
+
+
+def test_store_round_trip_by_layout(tmp_path):
+    rows = [{'Date': '2 Jan 2024', 'Details': 'Café'}]
+    with PageStore(tmp_path / 'pages.db') as store:
+        store.put_many({'a': rows}, TIDE)
+        assert store.get_many(['a', 'b', 'a'], TIDE) == {'a': rows}
+        # Rows parsed with learned columns are a different layout
+        columns = TIDE.with_header_columns([[
+            {'text': label, 'x': x, 'y': 760, 'height': 8}
+            for label, x in [('Date', 40), ('Details', 200), ('Paid in', 380), ('Paid out', 440), ('Balance', 510)]
+        ]])
+        assert store.get_many(['a'], columns) == {}
+
+
+def test_store_evicts_least_recently_used(tmp_path):
+    with PageStore(tmp_path / 'pages.db', max_pages=2) as store:
+        store.put_many({'a': [], 'b': []}, TIDE)
+        store.get_many(['a'], TIDE)
+        store.put_many({'c': []}, TIDE)
+        assert set(store.get_many(['a', 'b', 'c'], TIDE)) == {'a', 'c'}
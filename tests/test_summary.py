@@ -0,0 +1,43 @@
+import pandas as pd
+
+from converter.summary import summarize, to_pence
+
+
+def frame(rows):
+    return pd.DataFrame(rows, columns=['Paid in (£)', 'Paid out (£)', 'Category'])
+
+
+def test_to_pence():
+    assert to_pence(pd.Series(['1234.56', '', None, '0.10'])).tolist() == [123456, 0, 0, 10]
+
+
+def test_summarize_totals():
+    summary = summarize(frame([
+        ('100.10', '', 'Card Payments'),
+        ('0.20', '', 'Card Payments'),
+        ('50.00', '', 'Bank Transfers'),
+        ('', '30.00', 'Utilities & Communications'),
+        ('', '5.05', 'Bank Fees & Charges'),
+        ('', '10.00', 'Utilities & Communications'),
+    ]))
+    assert summary['income'] == [('Card Payments', 10030), ('Bank Transfers', 5000)]
+    assert summary['expenses'] == [('Utilities & Communications', 4000), ('Bank Fees & Charges', 505)]
+    assert summary['total_income'] == 15030
+    assert summary['total_expenses'] == 4505
+    assert summary['net_movement'] == 10525
+    assert summary['trial_balance'] == [
+        ('INCOME', [('Bank Transfers', None, 5000), ('Card Payments', None, 10030)]),
+        ('EXPENSES', [('Bank Fees & Charges', 505, None), ('Utilities & Communications', 4000, None)]),
+        ('ASSETS', [('Bank Account', 10525, None)]),
+    ]
+    assert summary['total_debit'] == summary['total_credit'] == 15030
+
+
+def test_summarize_net_outflow_credits_bank():
+    summary = summarize(frame([
+        ('10.00', '', 'Other Income'),
+        ('', '25.50', 'Rent & Property'),
+    ]))
+    assert summary['net_movement'] == -1550
+    assert summary['trial_balance'][-1] == ('ASSETS', [('Bank Account', None, 1550)])
+    assert summary['total_debit'] == summary['total_credit'] == 2550
@@ -0,0 +1,59 @@
+from datetime import datetime
+
+import pandas as pd
+import pytest
+from openpyxl import Workbook, load_workbook
+
+from converter import xlsx
+from converter.extraction import CSV_COLUMNS
+from converter.xlsx import write_xlsx
+
+ROWS = [
+    ['2 Jan 2024', 'Domestic Transfer', 'SUMUP PAYMENTS', 'Card Payments', '120.50', '', '1120.50'],
+    ['3 Jan 2024', 'Direct Debit', 'BT Group', 'Utilities & Communications', '', '30.00', '1090.50'],
+    ['4 Jan 2024', 'Fee', 'Monthly fee, "standard"', 'Bank Fees & Charges', '', '5.25', '1085.25'],
+]
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    path = tmp_path / 'statement.xlsx'
+    write_xlsx(pd.DataFrame(ROWS, columns=CSV_COLUMNS), path)
+    return load_workbook(path)
+
+
+def test_sheets(workbook):
+    assert workbook.sheetnames == ['Transactions', 'Category Summary', 'Trial Balance']
+
+
+def test_transactions_are_typed(workbook):
+    rows = list(workbook['Transactions'].values)
+    assert rows[0] == tuple(CSV_COLUMNS)
+    assert rows[1:] == [
+        (datetime(2024, 1, 2), 'Domestic Transfer', 'SUMUP PAYMENTS', 'Card Payments', 120.5, None, 1120.5),
+        (datetime(2024, 1, 3), 'Direct Debit', 'BT Group', 'Utilities & Communications', None, 30.0, 1090.5),
+        (datetime(2024, 1, 4), 'Fee', 'Monthly fee, "standard"', 'Bank Fees & Charges', None, 5.25, 1085.25),
+    ]
+    ws = workbook['Transactions']
+    assert ws['A2'].number_format == xlsx.DATE_FORMAT
+    assert ws['E2'].number_format == xlsx.AMOUNT_FORMAT
+
+
+def test_summary_sheets(workbook):
+    assert list(workbook['Category Summary'].values)[1:] == [
+        ('Income', 'Card Payments', 120.5),
+        ('Expense', 'Utilities & Communications', 30.0),
+        ('Expense', 'Bank Fees & Charges', 5.25),
+    ]
+    trial_balance = [row for row in workbook['Trial Balance'].values if any(row)]
+    assert trial_balance[-1] == ('TOTAL', 120.5, 120.5)
+    assert ('Bank Account', 85.25, None) in trial_balance
+
+
+@pytest.mark.parametrize('chunk_rows', [1, 2])
+def test_transactions_across_chunks(tmp_path, workbook, chunk_rows):
+    wb = Workbook(write_only=True)
+    xlsx._write_transactions(wb.create_sheet('Transactions'), pd.DataFrame(ROWS, columns=CSV_COLUMNS), CSV_COLUMNS, chunk_rows)
+    wb.save(tmp_path / 'chunked.xlsx')
+    chunked = load_workbook(tmp_path / 'chunked.xlsx')['Transactions']
+    assert list(chunked.values) == list(workbook['Transactions'].values)